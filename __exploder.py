@@ -6,9 +6,7 @@ from losalamos.refs import Ref
 
 def process_bibtex(src_folder):
     f = f"{src_folder}/src.bib"
-    ls = Ref.parse_bibtex(file_bib=f)
-
-    for e in ls:
+    for e in Ref.iter_bibtex(file_bib=f):
         r = Ref()
         r.set(dict_setter=e.copy())
         r.bib_dict = e.copy()
@@ -10,9 +10,6 @@ import shutil
 import subprocess
 from pathlib import Path
 import pandas as pd
-from lxml import etree
-from PIL import Image
-import PyPDF2
 from losalamos.root import Collection, DataSet, MbaE
 
 
@@ -32,6 +29,8 @@ def merge_pdfs(lst_pdfs, dst_dir, output_filename):
     :return: path to output file
     :rtype: str
     """
+    import PyPDF2
+
     if len(lst_pdfs) == 0:
         return None
     else:
@@ -80,9 +79,6 @@ class Drawing(DataSet):
         """
         # refresh all mutable attributes
 
-        # set fields
-        self._set_fields()
-
         if self.data is not None:
             # data size
             # todo handle size in SVG
@@ -109,6 +105,7 @@ class Drawing(DataSet):
         :return: None
         :rtype: None
         """
+        from lxml import etree
 
         # -------------- overwrite relative path input -------------- #
         self.file_data = os.path.abspath(file_data)
@@ -133,6 +130,8 @@ class Drawing(DataSet):
         return None
 
     def save(self):
+        from lxml import etree
+
         xml_str = etree.tostring(
             self.tree, encoding="utf-8", xml_declaration=True, pretty_print=False
         )
@@ -341,6 +340,8 @@ class Drawing(DataSet):
 
     @staticmethod
     def convert_png_to_jpg(input_file, output_file, quality=95, dpi=None):
+        from PIL import Image
+
         with Image.open(input_file) as img:
             # Convert to RGB if the image has an alpha channel
             if img.mode != "RGB":
@@ -353,6 +354,41 @@ class Drawing(DataSet):
 
 
 class Figure(MbaE):
+    # Attribute fields
+    fig_id_field = "Id"
+    caption_field = "Caption"
+    caption_lof_field = "Caption LOF"
+    status_t1_field = "Status Tier 1"
+    status_t2_field = "Status Tier 2"
+    descr_field = "Description"
+    comms_field = "Comments"
+    part_field = "Part"
+    label_field = "Label"
+    figsize_field = "Size"
+    playout_field = "Layout"
+    thumbnail_t1_file_field = "Thumbnail Tier 1"
+    thumbnail_t2_file_field = "Thumbnail Tier 2"
+
+    __slots__ = (
+        "fig_id",
+        "caption",
+        "caption_lof",
+        "label",
+        "status_t1",
+        "status_t2",
+        "part",
+        "figsize",
+        "layout",
+        "description",
+        "comments",
+        "fig_file",
+        "svg_file",
+        "thumbnail_file",
+        "thumbnail_t1_file",
+        "thumbnail_t2_file",
+        "pannels_dct",
+    )
+
     def __init__(self, name="MyFig", alias="Fig"):
         super().__init__(name=name, alias=alias)
         # setup attributes
@@ -374,27 +410,6 @@ class Figure(MbaE):
         self.thumbnail_t2_file = None
         self.pannels_dct = None
 
-    def _set_fields(self):
-        """
-        Set fields names
-        """
-        super()._set_fields()
-        # Attribute fields
-        self.fig_id_field = "Id"
-        self.caption_field = "Caption"
-        self.caption_lof_field = "Caption LOF"
-        self.status_t1_field = "Status Tier 1"
-        self.status_t2_field = "Status Tier 2"
-        self.descr_field = "Description"
-        self.comms_field = "Comments"
-        self.part_field = "Part"
-        self.label_field = "Label"
-        self.figsize_field = "Size"
-        self.playout_field = "Layout"
-        self.thumbnail_t1_file_field = "Thumbnail Tier 1"
-        self.thumbnail_t2_file_field = "Thumbnail Tier 2"
-        # ... continues in downstream objects ... #
-
     def get_metadata(self):
         """
         Get a dictionary with object metadata.
@@ -424,6 +439,27 @@ class Figure(MbaE):
 
         return dict_meta
 
+    def set(self, dict_setter):
+        """Set selected attributes based on an incoming dictionary
+
+        :param dict_setter: incoming dictionary with attribute values
+        :type dict_setter: dict
+        """
+        super().set(dict_setter=dict_setter)
+        self.fig_id = dict_setter[self.fig_id_field]
+        self.caption = dict_setter[self.caption_field]
+        self.caption_lof = dict_setter[self.caption_lof_field]
+        self.status_t1 = dict_setter[self.status_t1_field]
+        self.status_t2 = dict_setter[self.status_t2_field]
+        self.description = dict_setter[self.descr_field]
+        self.comments = dict_setter[self.comms_field]
+        self.part = dict_setter[self.part_field]
+        self.figsize = dict_setter[self.figsize_field]
+        self.layout = dict_setter[self.playout_field]
+        self.label = dict_setter[self.label_field]
+        self.thumbnail_t1_file = dict_setter[self.thumbnail_t1_file_field]
+        self.thumbnail_t2_file = dict_setter[self.thumbnail_t2_file_field]
+
     def to_latex(
         self,
         folder=None,
@@ -582,6 +618,8 @@ class Figure(MbaE):
         :return: None
         :rtype: None
         """
+        from PIL import Image
+
         img = Image.open(input_path)
 
         # Compute new dimensions while maintaining aspect ratio
@@ -603,24 +641,7 @@ class FigureColl(Collection):
 
     def load_catalog(self, df_file):
         df = pd.read_csv(df_file, sep=";")
-        for i in range(len(df)):
-            _NewFig = Figure()
-            _NewFig.name = df[_NewFig.name_field].values[i]
-            _NewFig.alias = df[_NewFig.alias_field].values[i]
-            _NewFig.fig_id = df[_NewFig.fig_id_field].values[i]
-            _NewFig.caption = df[_NewFig.caption_field].values[i]
-            _NewFig.caption_lof = df[_NewFig.caption_lof_field].values[i]
-            _NewFig.status_t1 = df[_NewFig.status_t1_field].values[i]
-            _NewFig.status_t2 = df[_NewFig.status_t2_field].values[i]
-            _NewFig.description = df[_NewFig.descr_field].values[i]
-            _NewFig.comments = df[_NewFig.comms_field].values[i]
-            _NewFig.part = df[_NewFig.part_field].values[i]
-            _NewFig.figsize = df[_NewFig.figsize_field].values[i]
-            _NewFig.layout = df[_NewFig.playout_field].values[i]
-            _NewFig.label = df[_NewFig.label_field].values[i]
-            _NewFig.thumbnail_t1_file = df[_NewFig.thumbnail_t1_file_field].values[i]
-            _NewFig.thumbnail_t2_file = df[_NewFig.thumbnail_t2_file_field].values[i]
-            self.append(new_object=_NewFig)
+        self.from_records(records=df)
 
 
 class TeX(MbaE):
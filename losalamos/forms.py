@@ -0,0 +1,193 @@
+"""
+Graphical forms for the command-line tools
+
+Description:
+    The ``forms`` module provides ``tkinter`` forms. It is kept apart from
+    the other modules so that ``tkinter`` is only imported when a form is used
+
+License:
+    This software is released under the GNU General Public License v3.0 (GPL-3.0).
+    For details, see: https://www.gnu.org/licenses/gpl-3.0.html
+
+Author:
+    Iporã Possantti
+
+Contact:
+    possantti@gmail.com
+
+"""
+
+import tkinter as tk
+from tkinter import filedialog
+
+
+class RefForm(tk.Tk):
+    def __init__(self, lib_folder, inp_folder, kind_opts, title="Add References"):
+        super().__init__()
+        self.title(title)
+        self.geometry("550x450")
+        self.folder_lib_def = lib_folder
+        self.folder_inp_def = inp_folder
+        self.options_def = kind_opts[:]
+        self.form_data = {}
+        self.create_widgets()
+
+    def create_widgets(self):
+        # Output folder
+        tk.Label(self, text="Library Folder:").grid(
+            row=0, column=0, padx=4, pady=4, sticky="w"
+        )
+        self.folder_lib = tk.Entry(self, width=50)
+        self.folder_lib.grid(row=0, column=1, padx=10, pady=4)
+        self.folder_lib.insert(0, self.folder_lib_def)
+        tk.Button(self, text="Browse", command=self.browse_folder_lib).grid(
+            row=0, column=2, padx=4, pady=4
+        )
+
+        # Input folder
+        tk.Label(self, text="Input Folder:").grid(
+            row=1, column=0, padx=4, pady=4, sticky="w"
+        )
+        self.folder_inp = tk.Entry(self, width=50)
+        self.folder_inp.grid(row=1, column=1, padx=10, pady=4)
+        self.folder_inp.insert(0, self.folder_inp_def)
+        tk.Button(self, text="Browse", command=self.browse_folder_inp).grid(
+            row=1, column=2, padx=4, pady=4
+        )
+
+        # Kind of input
+        tk.Label(self, text="Entry type:").grid(
+            row=2, column=0, padx=4, pady=4, sticky="w"
+        )
+        self.kind_var = tk.StringVar(self)
+        self.kind_var.set("paper")  # default value
+        kind_options = self.options_def[:]
+        self.kind_menu = tk.OptionMenu(self, self.kind_var, *kind_options)
+        self.kind_menu.grid(row=2, column=1, padx=10, pady=4, sticky="w")
+
+        # Tags
+        tk.Label(self, text="Tags:").grid(row=4, column=0, padx=4, pady=4, sticky="w")
+        self.tags_listbox = tk.Listbox(self, selectmode=tk.SINGLE, width=50, height=6)
+        self.tags_listbox.grid(row=3, column=1, padx=10, pady=4)
+        self.tags_entry = tk.Entry(self, width=40)
+        self.tags_entry.grid(row=4, column=1, padx=10, pady=5, sticky="w")
+        tk.Button(self, text="Add", width=6, command=self.add_tag).grid(
+            row=4, column=2, padx=2, pady=5, sticky="w"
+        )
+        tk.Button(self, text="Remove", width=6, command=self.remove_tag).grid(
+            row=4, column=3, padx=4, pady=5, sticky="w"
+        )
+
+        # Related notes
+        tk.Label(self, text="Related:").grid(
+            row=6, column=0, padx=4, pady=4, sticky="w"
+        )
+        self.related_listbox = tk.Listbox(
+            self, selectmode=tk.SINGLE, width=50, height=3
+        )
+        self.related_listbox.grid(row=5, column=1, padx=10, pady=4)
+        self.related_entry = tk.Entry(self, width=40)
+        self.related_entry.grid(row=6, column=1, padx=10, pady=5, sticky="w")
+        tk.Button(self, text="Add", width=6, command=self.add_related).grid(
+            row=6, column=2, padx=2, pady=5, sticky="w"
+        )
+        tk.Button(self, text="Remove", width=6, command=self.remove_related).grid(
+            row=6, column=3, padx=4, pady=5, sticky="w"
+        )
+
+        # Include BIB file
+        tk.Label(self, text="Include BibTeX:").grid(
+            row=7, column=0, padx=4, pady=4, sticky="w"
+        )
+        self.include_bib = tk.BooleanVar()
+        tk.Checkbutton(self, variable=self.include_bib).grid(
+            row=7, column=1, padx=10, pady=4, sticky="w"
+        )
+
+        # Submit button
+        tk.Button(self, text="Submit", command=self.submit_form).grid(
+            row=8, column=0, columnspan=3, pady=20
+        )
+        tk.Button(self, text="Cancel", command=self.cancel_form).grid(
+            row=8, column=1, columnspan=3, padx=10, pady=20
+        )
+
+    def browse_folder_lib(self):
+        folder = filedialog.askdirectory()
+        if folder:
+            self.folder_lib.delete(0, tk.END)
+            self.folder_lib.insert(0, folder)
+
+    def browse_folder_inp(self):
+        folder = filedialog.askdirectory()
+        if folder:
+            self.folder_inp.delete(0, tk.END)
+            self.folder_inp.insert(0, folder)
+
+    @staticmethod
+    def covert_entry_to_list(entry_str):
+        # todo evaluate move
+        # replace commas
+        entry_str = entry_str.replace(", ", ";")
+        entry_str = entry_str.replace(",", ";")
+        # drop hashs
+        entry_str = entry_str.replace("#", "")
+        # get list
+        entry_ls = entry_str.split(";")
+        entry_ls = [e.strip() for e in entry_ls]
+        # remove duplicates
+        entry_ls = list(set(entry_ls))
+        return entry_ls
+
+    def add_tag(self):
+        tag = self.tags_entry.get()
+        if tag:
+            tag_ls = RefForm.covert_entry_to_list(entry_str=tag)
+            tag_ls = [tag.replace(" ", "-").lower() for tag in tag_ls]
+            for tag in tag_ls:
+                self.tags_listbox.insert(tk.END, f"#{tag}")
+            self.tags_entry.delete(0, tk.END)
+
+    def remove_tag(self):
+        selected_tag_index = self.tags_listbox.curselection()
+        if selected_tag_index:
+            self.tags_listbox.delete(selected_tag_index)
+
+    def add_related(self):
+        related_note = self.related_entry.get()
+        if related_note:
+            rel_ls = RefForm.covert_entry_to_list(entry_str=related_note)
+            rel_ls = [related_note.strip() for related_note in rel_ls]
+            for related_note in rel_ls:
+                self.related_listbox.insert(tk.END, f"[[{related_note}]]")
+            self.related_entry.delete(0, tk.END)
+
+    def remove_related(self):
+        selected_related_index = self.related_listbox.curselection()
+        if selected_related_index:
+            self.related_listbox.delete(selected_related_index)
+
+    def submit_form(self):
+        folder_lib = self.folder_lib.get()
+        folder_inp = self.folder_inp.get()
+        kind = self.kind_var.get()
+        tags = list(self.tags_listbox.get(0, tk.END))
+        related = list(self.related_listbox.get(0, tk.END))
+        include_bib = self.include_bib.get()
+
+        self.form_data = {
+            "folder_lib": folder_lib,
+            "folder_inp": folder_inp,
+            "kind": kind,
+            "tags": tags,
+            "related": related,
+            "include_bib": include_bib,
+        }
+        self.quit()  # Close the Tkinter window
+
+    def cancel_form(self):
+        self.form_data = None
+        self.quit()
+
+    def get_form_data(self):
+        return self.form_data
@@ -46,190 +46,25 @@ eu eros euismod sodales. Cras pulvinar tincidunt enim nec semper.
 
 """
 
-import glob
+import json
+import mmap
 import os
 import re
 import shutil
-import tkinter as tk
-from tkinter import filedialog
-
-import requests
+import sqlite3
+import threading
+import time
 
 from losalamos.root import Collection, MbaE, Note
 
 
-class RefForm(tk.Tk):
-    # todo evaluate move or rebase
-
-    def __init__(self, lib_folder, inp_folder, kind_opts, title="Add References"):
-        super().__init__()
-        self.title(title)
-        self.geometry("550x450")
-        self.folder_lib_def = lib_folder
-        self.folder_inp_def = inp_folder
-        self.options_def = kind_opts[:]
-        self.form_data = {}
-        self.create_widgets()
-
-    def create_widgets(self):
-        # Output folder
-        tk.Label(self, text="Library Folder:").grid(
-            row=0, column=0, padx=4, pady=4, sticky="w"
-        )
-        self.folder_lib = tk.Entry(self, width=50)
-        self.folder_lib.grid(row=0, column=1, padx=10, pady=4)
-        self.folder_lib.insert(0, self.folder_lib_def)
-        tk.Button(self, text="Browse", command=self.browse_folder_lib).grid(
-            row=0, column=2, padx=4, pady=4
-        )
-
-        # Input folder
-        tk.Label(self, text="Input Folder:").grid(
-            row=1, column=0, padx=4, pady=4, sticky="w"
-        )
-        self.folder_inp = tk.Entry(self, width=50)
-        self.folder_inp.grid(row=1, column=1, padx=10, pady=4)
-        self.folder_inp.insert(0, self.folder_inp_def)
-        tk.Button(self, text="Browse", command=self.browse_folder_inp).grid(
-            row=1, column=2, padx=4, pady=4
-        )
-
-        # Kind of input
-        tk.Label(self, text="Entry type:").grid(
-            row=2, column=0, padx=4, pady=4, sticky="w"
-        )
-        self.kind_var = tk.StringVar(self)
-        self.kind_var.set("paper")  # default value
-        kind_options = self.options_def[:]
-        self.kind_menu = tk.OptionMenu(self, self.kind_var, *kind_options)
-        self.kind_menu.grid(row=2, column=1, padx=10, pady=4, sticky="w")
-
-        # Tags
-        tk.Label(self, text="Tags:").grid(row=4, column=0, padx=4, pady=4, sticky="w")
-        self.tags_listbox = tk.Listbox(self, selectmode=tk.SINGLE, width=50, height=6)
-        self.tags_listbox.grid(row=3, column=1, padx=10, pady=4)
-        self.tags_entry = tk.Entry(self, width=40)
-        self.tags_entry.grid(row=4, column=1, padx=10, pady=5, sticky="w")
-        tk.Button(self, text="Add", width=6, command=self.add_tag).grid(
-            row=4, column=2, padx=2, pady=5, sticky="w"
-        )
-        tk.Button(self, text="Remove", width=6, command=self.remove_tag).grid(
-            row=4, column=3, padx=4, pady=5, sticky="w"
-        )
-
-        # Related notes
-        tk.Label(self, text="Related:").grid(
-            row=6, column=0, padx=4, pady=4, sticky="w"
-        )
-        self.related_listbox = tk.Listbox(
-            self, selectmode=tk.SINGLE, width=50, height=3
-        )
-        self.related_listbox.grid(row=5, column=1, padx=10, pady=4)
-        self.related_entry = tk.Entry(self, width=40)
-        self.related_entry.grid(row=6, column=1, padx=10, pady=5, sticky="w")
-        tk.Button(self, text="Add", width=6, command=self.add_related).grid(
-            row=6, column=2, padx=2, pady=5, sticky="w"
-        )
-        tk.Button(self, text="Remove", width=6, command=self.remove_related).grid(
-            row=6, column=3, padx=4, pady=5, sticky="w"
-        )
-
-        # Include BIB file
-        tk.Label(self, text="Include BibTeX:").grid(
-            row=7, column=0, padx=4, pady=4, sticky="w"
-        )
-        self.include_bib = tk.BooleanVar()
-        tk.Checkbutton(self, variable=self.include_bib).grid(
-            row=7, column=1, padx=10, pady=4, sticky="w"
-        )
-
-        # Submit button
-        tk.Button(self, text="Submit", command=self.submit_form).grid(
-            row=8, column=0, columnspan=3, pady=20
-        )
-        tk.Button(self, text="Cancel", command=self.cancel_form).grid(
-            row=8, column=1, columnspan=3, padx=10, pady=20
-        )
+def __getattr__(name):
+    # ``RefForm`` needs tkinter at class definition: import it on demand
+    if name == "RefForm":
+        from losalamos.forms import RefForm
 
-    def browse_folder_lib(self):
-        folder = filedialog.askdirectory()
-        if folder:
-            self.folder_lib.delete(0, tk.END)
-            self.folder_lib.insert(0, folder)
-
-    def browse_folder_inp(self):
-        folder = filedialog.askdirectory()
-        if folder:
-            self.folder_inp.delete(0, tk.END)
-            self.folder_inp.insert(0, folder)
-
-    @staticmethod
-    def covert_entry_to_list(entry_str):
-        # todo evaluate move
-        # replace commas
-        entry_str = entry_str.replace(", ", ";")
-        entry_str = entry_str.replace(",", ";")
-        # drop hashs
-        entry_str = entry_str.replace("#", "")
-        # get list
-        entry_ls = entry_str.split(";")
-        entry_ls = [e.strip() for e in entry_ls]
-        # remove duplicates
-        entry_ls = list(set(entry_ls))
-        return entry_ls
-
-    def add_tag(self):
-        tag = self.tags_entry.get()
-        if tag:
-            tag_ls = RefForm.covert_entry_to_list(entry_str=tag)
-            tag_ls = [tag.replace(" ", "-").lower() for tag in tag_ls]
-            for tag in tag_ls:
-                self.tags_listbox.insert(tk.END, f"#{tag}")
-            self.tags_entry.delete(0, tk.END)
-
-    def remove_tag(self):
-        selected_tag_index = self.tags_listbox.curselection()
-        if selected_tag_index:
-            self.tags_listbox.delete(selected_tag_index)
-
-    def add_related(self):
-        related_note = self.related_entry.get()
-        if related_note:
-            rel_ls = RefForm.covert_entry_to_list(entry_str=related_note)
-            rel_ls = [related_note.strip() for related_note in rel_ls]
-            for related_note in rel_ls:
-                self.related_listbox.insert(tk.END, f"[[{related_note}]]")
-            self.related_entry.delete(0, tk.END)
-
-    def remove_related(self):
-        selected_related_index = self.related_listbox.curselection()
-        if selected_related_index:
-            self.related_listbox.delete(selected_related_index)
-
-    def submit_form(self):
-        folder_lib = self.folder_lib.get()
-        folder_inp = self.folder_inp.get()
-        kind = self.kind_var.get()
-        tags = list(self.tags_listbox.get(0, tk.END))
-        related = list(self.related_listbox.get(0, tk.END))
-        include_bib = self.include_bib.get()
-
-        self.form_data = {
-            "folder_lib": folder_lib,
-            "folder_inp": folder_inp,
-            "kind": kind,
-            "tags": tags,
-            "related": related,
-            "include_bib": include_bib,
-        }
-        self.quit()  # Close the Tkinter window
-
-    def cancel_form(self):
-        self.form_data = None
-        self.quit()
-
-    def get_form_data(self):
-        return self.form_data
+        return RefForm
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Ref(MbaE):
@@ -323,6 +158,37 @@ class Ref(MbaE):
 
     """
 
+    # Attribute fields
+    citation_key_field = "citation_key"
+    type_field = "entry_type"
+    title_field = "title"
+    author_field = "author"
+    year_field = "year"
+    file_bib_field = "file_bib"
+    file_note_field = "file_note"
+    file_doc_field = "file_doc"
+
+    # compiled patterns of the BibTeX tokenizer (see :meth:`scan_bibtex`)
+    _bib_patterns = None
+
+    __slots__ = (
+        "entry_type",
+        "citation_key",
+        "title",
+        "author",
+        "year",
+        "file_bib",
+        "file_note",
+        "file_doc",
+        "lib_folder",
+        "bib_dict",
+        "note",
+        "note_comments",
+        "note_tags",
+        "note_related",
+        "references_list",
+    )
+
     def __init__(
         self,
         entry_type="book",
@@ -383,22 +249,6 @@ class Ref(MbaE):
         super().__init__(name=_name, alias=_alias)
         # ... continues in downstream objects ... #
 
-    def _set_fields(self):
-        """Set fields names"""
-        super()._set_fields()
-        # Attribute fields
-        self.citation_key_field = "citation_key"
-        self.type_field = "entry_type"
-        self.title_field = "title"
-        self.author_field = "author"
-        self.year_field = "year"
-        self.file_bib_field = "file_bib"
-        self.file_note_field = "file_note"
-        self.file_doc_field = "file_doc"
-        # Metadata fields
-
-        # ... continues in downstream objects ... #
-
     def get_metadata(self):
         """Get a dictionary with object metadata.
         Expected to increment superior methods.
@@ -483,39 +333,72 @@ class Ref(MbaE):
 
         # ... continues in downstream objects ... #
 
-    def load_bib(self, order=0):
+    def load_bib(self, order=0, key=None, use_index=False):
         """Load reference from ``bib`` file.
 
         :param order: order number in the ``bib`` file (first = 0)
         :entry_type order: int
+        :param key: citation key of the reference. If provided, ``order`` is ignored.
+        :entry_type key: str
+        :param use_index: option for seeking the entry through the byte-offset index
+            of the ``bib`` file (see :meth:`Ref.get_bib_index`). Default is False,
+            which scans the file up to the entry.
+        :entry_type use_index: bool
         :return: None
         :rtype: None
         """
-        list_refs = self.parse_bibtex(file_bib=self.file_bib)
-        self.bib_dict = list_refs[order]
-        self.set(dict_setter=list_refs[order])
+        if use_index:
+            bib_dict = Ref.read_bib_entry(file_bib=self.file_bib, order=order, key=key)
+        else:
+            bib_dict = None
+            for i, entry in enumerate(Ref.iter_bibtex(file_bib=self.file_bib)):
+                if key is None and i == order:
+                    bib_dict = entry
+                    break
+                if key is not None and entry[self.citation_key_field] == key:
+                    bib_dict = entry
+                    break
+            if bib_dict is None:
+                if key is None:
+                    raise IndexError(f"entry {order} not found in {self.file_bib}")
+                raise KeyError(f"entry {key} not found in {self.file_bib}")
+        self.bib_dict = bib_dict
+        self.set(dict_setter=bib_dict)
         return None
 
-    def load_note(self):
+    def load_note(self, scan=None):
         """Loads a note and assigns it to the instance variable.
 
         This method initializes a RefNote object with the instance's name and alias,
         sets its file_note attribute, and then calls the load method on the RefNote object.
+
+        :param scan: Optional output of :meth:`RefNote.scan_note` for the note file, to avoid reading it again
+        :type scan: dict or None
         """
         self.note = RefNote(name=self.name, alias=self.alias)
         self.note.file_note = self.file_note
-        self.note.load()
+        if scan is None:
+            self.note.load()
+        else:
+            self.note.metadata = scan["metadata"]
+            self.note._standardize_metatada()
+            self.note.data = scan["data"]
 
-    def standardize(self):
+    def standardize(self, registry=None):
         """Standardize citation key, author formatting
 
+        :param registry: loaded citation key registry of the library. If provided,
+            the new key is checked and reserved against it instead of listing the library folder.
+        :type registry: :class:`RefKeys`
         :return: None
         :rtype: None
         """
         conflict_list = None
-        if self.lib_folder:
+        if registry is not None:
+            conflict_list = registry
+        elif self.lib_folder:
             if os.path.isdir(self.lib_folder):
-                conflict_list = Ref.get_citation_keys(lib_folder=self.lib_folder)
+                conflict_list = set(Ref.get_citation_keys(lib_folder=self.lib_folder))
 
         # set standard author
         self.author = Ref.standard_author(bib_dict=self.bib_dict)
@@ -526,6 +409,8 @@ class Ref(MbaE):
             bib_dict=self.bib_dict, conflict_list=conflict_list
         )
         self.bib_dict[self.citation_key_field] = self.citation_key
+        if registry is not None:
+            registry.reserve(key=self.citation_key)
 
         # Name and Alias
         self.name = Ref.cite_intext(bib_dict=self.bib_dict, text_format="plain")
@@ -588,11 +473,8 @@ class Ref(MbaE):
         """
         from datetime import datetime
 
-        # get note
-        n = RefNote()
-        n.file_note = note_template
-        # load template data
-        n.load()
+        # get note from the (cached) template
+        n = RefNote.load_template(file_template=note_template)
         # set incoming data for the body
         if body:
             n.data["Body"] = body[:]
@@ -629,6 +511,30 @@ class Ref(MbaE):
         n.save()
         return output_file
 
+    def get_lib_name(self):
+        """Get the default file name (no extension) of the reference in the library.
+
+        Papers are named by the citation key, theses by ``Author (year)``
+        and anything else by the title.
+
+        :return: file name of the PDF and the note
+        :rtype: str
+        """
+        # paper is the ckey
+        if self.bib_dict["entry_type"] == "article":
+            return self.bib_dict["citation_key"]
+        # thesis is the author (year) name
+        elif self.bib_dict["entry_type"] == "thesis":
+            author_full = (
+                self.author.split(",")[1].strip()
+                + " "
+                + self.author.split(",")[0].strip()
+            )
+            return "{} ({})".format(author_full, self.year)
+        # else
+        else:
+            return self.bib_dict["title"]
+
     def add_to_lib(
         self,
         lib_folder,
@@ -638,6 +544,7 @@ class Ref(MbaE):
         comments=None,
         pdf_name=None,
         note_name=None,
+        registry=None,
     ):
         """Adds the current item to the specified library folder.
 
@@ -653,6 +560,8 @@ class Ref(MbaE):
         :type pdf_name: str or None
         :param note_name: Optional note file name
         :type note_name: str or None
+        :param registry: Optional loaded citation key registry of the library
+        :type registry: :class:`RefKeys` or None
         :return: None
         :rtype: None
         """
@@ -660,21 +569,11 @@ class Ref(MbaE):
         self.lib_folder = lib_folder
 
         # Standardize citation key
-        self.standardize()
+        self.standardize(registry=registry)
 
         # export pdf
         if pdf_name is None:
-            if self.bib_dict["entry_type"] == "article":
-                pdf_name = self.bib_dict["citation_key"]
-            elif self.bib_dict["entry_type"] == "thesis":
-                author_full = (
-                    self.author.split(",")[1].strip()
-                    + " "
-                    + self.author.split(",")[0].strip()
-                )
-                pdf_name = "{} ({})".format(author_full, self.year)
-            else:
-                pdf_name = self.bib_dict["title"]
+            pdf_name = self.get_lib_name()
         dst_pdf = "{}/{}.pdf".format(self.lib_folder, pdf_name)
         # copy to libfolder
         shutil.copy(src=self.file_doc, dst=dst_pdf)  # expected to be defined
@@ -682,20 +581,7 @@ class Ref(MbaE):
 
         # export note
         if note_name is None:
-            # paper is the ckey
-            if self.bib_dict["entry_type"] == "article":
-                note_name = self.bib_dict["citation_key"]
-            # thesis is the author (year) name
-            elif self.bib_dict["entry_type"] == "thesis":
-                author_full = (
-                    self.author.split(",")[1].strip()
-                    + " "
-                    + self.author.split(",")[0].strip()
-                )
-                note_name = "{} ({})".format(author_full, self.year)
-            # else
-            else:
-                note_name = self.bib_dict["title"]
+            note_name = self.get_lib_name()
 
         # get note now
         o = self.to_note(
@@ -768,83 +654,384 @@ class Ref(MbaE):
         :return: A dictionary with the BibTeX entry's type, citation key, and fields.
         :rtype: dict
         """
-        # Regular expression patterns
-        entry_pattern = re.compile(r"@\w+\{")
-        key_pattern = re.compile(r"@\w+\{(.+?),")
-        field_pattern = re.compile(r'(\w+)\s*=\s*[{"](.*?)[}"],?', re.DOTALL)
+        # the first entry in the string
+        for bib_dict in Ref.scan_bibtex(lines=[bibtex_str]):
+            return bib_dict
+        raise ValueError("Invalid BibTeX entry format")
 
-        # Extract entry type and citation key
-        entry_type_match = entry_pattern.search(bibtex_str)
-        key_match = key_pattern.search(bibtex_str)
+    @staticmethod
+    def parse_bibtex(file_bib):
+        """Parse a ``bib`` file and return a list of references as dictionaries.
 
-        if not entry_type_match or not key_match:
-            raise ValueError("Invalid BibTeX entry format")
+        :param file_bib: Path to the ``bib`` file.
+        :return: A list of dictionaries, each representing a BibTeX bib_dict.
+        """
+        return list(Ref.iter_bibtex(file_bib=file_bib))
 
-        entry_type = entry_type_match.group()[1:-1]
-        citation_key = key_match.group(1)
+    @staticmethod
+    def iter_bibtex(file_bib):
+        """Iterate over a ``bib`` file and yield one reference dictionary at a time.
 
-        # Create the dictionary with initial keys
-        bib_dict = {"entry_type": entry_type, "citation_key": citation_key}
+        The file is read in blocks, so only a block and the entry being scanned are kept in memory.
 
-        # Extract fields
-        fields = field_pattern.findall(bibtex_str)
-        for field in fields:
-            key, value = field
-            bib_dict[key.strip()] = value.strip()
+        :param file_bib: Path to the ``bib`` file.
+        :type file_bib: str
+        :return: A generator of dictionaries, each representing a BibTeX bib_dict.
+        :rtype: generator
+        """
+        with open(file_bib, "r", encoding="utf-8") as file:
+            yield from Ref.scan_bibtex(lines=iter(lambda: file.read(65536), ""))
 
-        return bib_dict
+    @staticmethod
+    def index_bibtex(file_bib):
+        """Build the byte-offset index of a ``bib`` file.
+
+        Entries are expected to start on their own line (``@type{key,``).
+
+        :param file_bib: Path to the ``bib`` file.
+        :type file_bib: str
+        :return: A dictionary with the file ``mtime`` and ``size``, the list of
+            ``entries`` as ``[citation_key, start, end]`` byte offsets and the
+            ``keys`` dictionary of ``citation_key: [start, end]``.
+        :rtype: dict
+        """
+        header_pattern = re.compile(
+            rb"^[ \t]*@[ \t]*(\w+)[ \t]*\{[ \t]*([^,\s}]*)", re.MULTILINE
+        )
+        stat = os.stat(file_bib)
+        index = {
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "entries": [],
+            "keys": {},
+        }
+        if stat.st_size == 0:
+            return index
+        entries = index["entries"]
+        with open(file_bib, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for m in header_pattern.finditer(mm):
+                    # any block ends where the next one starts
+                    if entries and entries[-1][2] is None:
+                        entries[-1][2] = m.start()
+                    if m.group(1).lower() in [b"comment", b"preamble", b"string"]:
+                        continue
+                    key = m.group(2).decode("utf-8")
+                    entries.append([key, m.start(), None])
+        if entries and entries[-1][2] is None:
+            entries[-1][2] = stat.st_size
+        # the first entry of a repeated key wins
+        keys = index["keys"]
+        for key, start, end in entries:
+            if key not in keys:
+                keys[key] = [start, end]
+        return index
 
     @staticmethod
-    def parse_bibtex(file_bib):
-        """Parse a ``bib`` file and return a list of references as dictionaries.
+    def get_bib_index(file_bib, rebuild=False):
+        """Get the byte-offset index of a ``bib`` file.
+
+        The index is kept in a ``.idx`` sidecar file next to the ``bib`` file,
+        built once and rebuilt whenever the ``bib`` file ``mtime`` or size changes,
+        or the sidecar file is corrupt.
 
         :param file_bib: Path to the ``bib`` file.
-        :return: A list of dictionaries, each representing a BibTeX bib_dict.
+        :type file_bib: str
+        :param rebuild: option for forcing the index to be rebuilt.
+        :type rebuild: bool
+        :return: The index dictionary (see :meth:`Ref.index_bibtex`).
+        :rtype: dict
         """
-        entries = []
-        entry = None
-        key = None
+        file_index = f"{file_bib}.idx"
+        stat = os.stat(file_bib)
+        if not rebuild and os.path.isfile(file_index):
+            try:
+                with open(file_index, "r", encoding="utf-8") as file:
+                    index = json.load(file)
+                if (
+                    index["mtime"] == stat.st_mtime
+                    and index["size"] == stat.st_size
+                    and "keys" in index
+                ):
+                    return index
+            except (ValueError, KeyError, TypeError):
+                # corrupt or truncated sidecar file: index again
+                pass
+        index = Ref.index_bibtex(file_bib=file_bib)
+        try:
+            with open(file_index, "w", encoding="utf-8") as file:
+                json.dump(index, file)
+        except OSError:
+            # read-only folder, the index is used only in memory
+            pass
+        return index
 
-        with open(file_bib, "r", encoding="utf-8") as file:
-            for line in file:
-                line = line.strip()
-
-                # Ignore empty lines and body
-                if not line or line.startswith("%"):
-                    continue
-
-                # New bib_dict starts
-                if line.startswith("@"):
-                    if entry is not None:
-                        entries.append(entry)
-                    entry = {}
-                    # Extracting the entry_type and citation key
-                    entry_type, citation_key = line.lstrip("@").split("{", 1)
-                    entry["entry_type"] = entry_type
-                    entry["citation_key"] = citation_key.rstrip(",").strip()
-                elif "=" in line and entry is not None:
-                    # Extracting the field key and value
-                    key, value = line.split("=", 1)
-                    key = key.strip().lower()
-                    value = value.strip().strip("{").strip(",").strip("}")
+    @staticmethod
+    def read_bib_entry(file_bib, order=0, key=None):
+        """Read a single entry of a ``bib`` file by seeking its byte offset.
+
+        :param file_bib: Path to the ``bib`` file.
+        :type file_bib: str
+        :param order: order number in the ``bib`` file (first = 0)
+        :type order: int
+        :param key: citation key of the entry. If provided, ``order`` is ignored.
+        :type key: str
+        :return: The BibTeX dictionary of the entry.
+        :rtype: dict
+        """
+        index = Ref.get_bib_index(file_bib=file_bib)
+        if key is None:
+            citation_key, start, end = index["entries"][order]
+        else:
+            if key not in index["keys"]:
+                raise KeyError(f"entry {key} not found in {file_bib}")
+            start, end = index["keys"][key]
+        with open(file_bib, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                text = mm[start:end].decode("utf-8")
+        return Ref.bibstr_to_dict(bibtex_str=text)
+
+    @staticmethod
+    def _compile_bib_patterns():
+        """Compile the regular expressions of :meth:`Ref.scan_bibtex`.
+
+        :return: dictionary of compiled patterns by name
+        :rtype: dict
+        """
+        patterns = {}
+        patterns["header"] = re.compile(r"@\s*(\w+)\s*\{\s*([^,\s}]*)\s*,?")
+        # the opening of an entry, possibly split across chunks or lines
+        patterns["partial"] = re.compile(r"@\s*\w*\s*\Z")
+        patterns["field"] = re.compile(r"\s*([\w:.+-]+)\s*=\s*")
+        # text with balanced braces, one level deep
+        patterns["nested"] = re.compile(r"[^{}]*(?:\{[^{}]*\}[^{}]*)*")
+        # a field in the usual layout, one per line: key, braced value and comma
+        patterns["flat"] = re.compile(
+            r"\n[ \t]*([\w:.+-]+)[ \t]*=[ \t]*\{(.*)\}(,?)$", re.MULTILINE
+        )
+        patterns["bare"] = re.compile(r"[^,#}\s]*")
+        patterns["after"] = re.compile(r"\s*([#,]?)\s*")
+        patterns["newline"] = re.compile(r"\s*\n\s*")
+        patterns["brace"] = re.compile(r"[{}]")
+        patterns["quote"] = re.compile(r'\\.|[{}"]')
+        return patterns
+
+    @staticmethod
+    def scan_bibtex(lines):
+        """Scan BibTeX text and yield one entry dictionary at a time.
+
+        Entries are delimited by tracking the brace depth from the opening ``@type{``,
+        so fields may span several lines and values may be ``{}``-braced or ``"``-quoted.
+        Entries in the usual layout (one ``key = {value},`` per line and the closing
+        brace at the start of a line) take a fast path that reads all fields at once.
+        ``@comment``, ``@preamble`` and ``@string`` blocks are skipped.
+
+        .. note::
+
+            This is the tokenizer behind :meth:`Ref.parse_bibtex`, :meth:`Ref.bibstr_to_dict`
+            and :meth:`RefNote.get_bib`.
+
+        :param lines: Iterable of text chunks (e.g., an open file or a list of lines).
+        :type lines: iterable
+        :return: A generator of dictionaries, each representing a BibTeX bib_dict.
+        :rtype: generator
+        """
+        if Ref._bib_patterns is None:
+            # compiled once, on first use
+            Ref._bib_patterns = Ref._compile_bib_patterns()
+        patterns = Ref._bib_patterns
+        header_pattern = patterns["header"]
+        partial_pattern = patterns["partial"]
+        field_pattern = patterns["field"]
+        flat_pattern = patterns["flat"]
+        nested_pattern = patterns["nested"]
+        bare_pattern = patterns["bare"]
+        after_pattern = patterns["after"]
+        newline_pattern = patterns["newline"]
+        brace_pattern = patterns["brace"]
+        quote_pattern = patterns["quote"]
+
+        def match_brace(text, start):
+            # index of the brace closing the one opened at start
+            end = text.find("}", start)
+            if end < 0:
+                return len(text)
+            if text.find("{", start + 1, end) < 0:
+                return end
+            depth = 0
+            for m in brace_pattern.finditer(text, start):
+                if m.group() == "{":
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return m.start()
+            return len(text)
+
+        def match_quote(text, start):
+            # index of the quote closing the one opened at start
+            depth = 0
+            for m in quote_pattern.finditer(text, start + 1):
+                c = m.group()
+                if c == "{":
+                    depth += 1
+                elif c == "}":
+                    depth -= 1
+                elif c == '"' and depth == 0:
+                    return m.start()
+            return len(text)
+
+        def parse_flat(entry, text, pos, end):
+            # add the fields of text[pos:end] in the usual layout of one
+            # "key = {value}," per line to entry, else None
+            fields = flat_pattern.findall(text, pos, end)
+            # every line after the header holds one field
+            n_lines = text.count("\n", pos, end) - (text[end - 1] == "\n")
+            if len(fields) != n_lines:
+                return None
+            first = text.find("\n", pos, end)
+            if text[pos : first if first >= 0 else end].strip():
+                return None
+            if not fields:
+                return entry
+            keys, values, commas = zip(*fields)
+            if "" in commas[:-1]:
+                # a missing comma ends the entry
+                return None
+            size = len(entry) + len(keys)
+            entry.update(zip(map(str.lower, keys), map(str.strip, values)))
+            if len(entry) < size:
+                # repeated keys
+                return None
+            s_values = "".join(values)
+            if "{" in s_values or "}" in s_values:
+                for key in [k for k, v in entry.items() if "{" in v or "}" in v]:
+                    value = entry[key]
+                    if not nested_pattern.fullmatch(value):
+                        value = "{" + value + "}"
+                        if match_brace(value, 0) != len(value) - 1:
+                            # unbalanced, e.g. {a} # {b}
+                            return None
+                        value = value[1:-1]
+                    # drop redundant outer braces, e.g. {{Title}}
+                    while value[:1] == "{" and match_brace(value, 0) == len(value) - 1:
+                        value = value[1:-1].strip()
                     entry[key] = value
-                elif entry is not None and key:
-                    # Continuation of a field value in a new line
-                    entry[key] += " " + line.strip().strip("{").strip("}").strip(",")
-
-        # Add the last bib_dict if it exists
-        if entry is not None:
-            # ensure values are stripped:
-            entry_new = {}
-            for k in entry:
-                entry_new[k] = entry[k].strip()
-            entries.append(entry_new)
-
-        stripped_data = [
-            {key: value.strip() for key, value in item.items()} for item in entries
-        ]
+            return entry
 
-        return stripped_data
+        def parse_entry(text):
+            m = header_pattern.match(text)
+            entry_type = m.group(1).lower()
+            if entry_type in ["comment", "preamble", "string"]:
+                return None
+            entry = {"entry_type": entry_type, "citation_key": m.group(2)}
+            pos = m.end()
+            size = len(text)
+            sep = ","
+            while sep == ",":
+                m = field_pattern.match(text, pos)
+                if not m:
+                    break
+                key = m.group(1).lower()
+                pos = m.end()
+                parts = []
+                # value pieces, joined by the # operator
+                sep = "#"
+                while sep == "#" and pos < size:
+                    c = text[pos]
+                    if c == "{":
+                        end = match_brace(text, pos)
+                        parts.append(text[pos + 1 : end])
+                        pos = end + 1
+                    elif c == '"':
+                        end = match_quote(text, pos)
+                        parts.append(text[pos + 1 : end])
+                        pos = end + 1
+                    else:
+                        m = bare_pattern.match(text, pos)
+                        parts.append(m.group())
+                        pos = m.end()
+                    m = after_pattern.match(text, pos)
+                    sep = m.group(1)
+                    pos = m.end()
+                value = parts[0] if len(parts) == 1 else "".join(parts)
+                if "\n" in value:
+                    value = newline_pattern.sub(" ", value)
+                value = value.strip()
+                # drop redundant outer braces, e.g. {{Title}}
+                while (
+                    len(value) > 1
+                    and value[0] == "{"
+                    and match_brace(value, 0) == len(value) - 1
+                ):
+                    value = value[1:-1].strip()
+                entry[key] = value
+            return entry
+
+        # pieces of the entry being scanned
+        pieces = []
+        inside = False
+        depth = 0
+        # an unfinished "@type" at the end of the last chunk
+        carry = ""
+        for chunk in lines:
+            if carry:
+                chunk = carry + chunk
+                carry = ""
+            pos = 0
+            while True:
+                start = pos
+                if not inside:
+                    at = chunk.find("@", pos)
+                    if at < 0:
+                        break
+                    m = header_pattern.match(chunk, at)
+                    if not m:
+                        if partial_pattern.match(chunk, at):
+                            # the header may go on in the next chunk
+                            carry = chunk[at:]
+                            break
+                        # a loose "@" in free text
+                        pos = at + 1
+                        continue
+                    # fast path for the usual layout, the entry closing at the
+                    # start of a line: all fields in one pass
+                    end = chunk.find("\n}", m.end()) + 1
+                    entry_type = m.group(1).lower()
+                    if end > 0 and entry_type not in ["comment", "preamble", "string"]:
+                        entry = parse_flat(
+                            {"entry_type": entry_type, "citation_key": m.group(2)},
+                            chunk,
+                            m.end(),
+                            end,
+                        )
+                        if entry is not None:
+                            pos = end + 1
+                            yield entry
+                            continue
+                    # any other layout: delimit the entry by the brace depth
+                    start = at
+                    inside = True
+                    depth = 0
+                end = None
+                for m in brace_pattern.finditer(chunk, start):
+                    if m.group() == "{":
+                        depth += 1
+                    else:
+                        depth -= 1
+                        if depth == 0:
+                            end = m.end()
+                            break
+                if end is None:
+                    pieces.append(chunk[start:])
+                    break
+                pieces.append(chunk[start:end])
+                entry = parse_entry("".join(pieces))
+                pieces = []
+                inside = False
+                pos = end
+                if entry is not None:
+                    yield entry
 
     @staticmethod
     def cite_intext(bib_dict, text_format="plain", embed_link=False):
@@ -1255,18 +1442,32 @@ class Ref(MbaE):
         :param bib_dict: dict
             A dictionary containing bibliometric parameters from a reference.
             Expected key is 'author', 'year' and 'title'.
+        :param conflict_list: set, list or :class:`RefKeys`
+            Citation keys already taken. Sets and registries give constant-time checks.
         :return: str
             The string with normalized citation key.
         """
 
+        def next_suffix(suffix):
+            # a, b, ..., z, aa, ab, ..., az, ba, ..., zz, aaa, ...
+            chars = list(suffix)
+            i = len(chars) - 1
+            while i >= 0 and chars[i] == "z":
+                chars[i] = "a"
+                i = i - 1
+            if i < 0:
+                return "a" + "".join(chars)
+            chars[i] = chr(ord(chars[i]) + 1)
+            return "".join(chars)
+
         def next_available_name(base_name, conflict_names):
             # Initialize the suffix as 'a'
             suffix = "a"
 
             # Generate the name with the current suffix and check for conflicts
             while base_name + suffix in conflict_names:
-                # Move to the next letter in the alphabet
-                suffix = chr(ord(suffix) + 1)
+                # Move to the next suffix
+                suffix = next_suffix(suffix)
 
             # Return the first available name
             return base_name + suffix
@@ -1301,21 +1502,41 @@ class Ref(MbaE):
         return standard_key
 
     @staticmethod
-    def query_doi(doi):
+    def query_doi(doi, timeout=10, session=None, doi_url="https://doi.org", cache=None):
         """Web query for doi
 
         :param doi: reference doi
         :type doi: str
+        :param timeout: seconds to wait for the response
+        :type timeout: float
+        :param session: optional HTTP session for reusing connections
+        :type session: :class:`requests.Session`
+        :param doi_url: base URL of the DOI resolver
+        :type doi_url: str
+        :param cache: optional loaded response cache. Not found, timed out and
+            unparsable responses are cached as negative entries
+        :type cache: :class:`RefCache`
         :return: bibtex dict
         :rtype: dict or None
         """
+        import requests
+
+        cache_key = f"doi:{doi}"
+        if cache is not None:
+            cached = cache.get(key=cache_key)
+            if cached is not None:
+                return cached[1]
+            if cache.offline:
+                return None
         print(f">>> searching doi {doi}")
         # Construct the URL to retrieve the citation
-        url = f"https://doi.org/{doi}"
+        url = f"{doi_url}/{doi}"
+        if session is None:
+            session = requests
         try:
             # get the citation
-            bibtex_response = requests.get(
-                url, headers={"Accept": "application/x-bibtex"}
+            bibtex_response = session.get(
+                url, headers={"Accept": "application/x-bibtex"}, timeout=timeout
             )
 
             # Check if the request was successful
@@ -1324,24 +1545,95 @@ class Ref(MbaE):
                 bibtex_citation = bibtex_response.text
                 bib_dict = Ref.bibstr_to_dict(bibtex_citation)
                 bib_dict["doi"] = doi
+                if cache is not None:
+                    cache.put(key=cache_key, raw=bibtex_citation, parsed=bib_dict)
                 return bib_dict
+            elif bibtex_response.status_code == 404:
+                if cache is not None:
+                    cache.put(key=cache_key, raw=None, parsed=None)
+                return None
             else:
                 return None
         except requests.Timeout:
             print("The request timed out")
+            if cache is not None:
+                cache.put(key=cache_key, raw=None, parsed=None)
+            return None
+        except ValueError as e:
+            # not a BibTeX response
+            print(f"The request failed: {e}")
+            if cache is not None:
+                cache.put(key=cache_key, raw=None, parsed=None)
+            return None
+        except requests.RequestException as e:
+            print(f"The request failed: {e}")
             return None
 
     @staticmethod
-    def query_xref(search_query, include_refs=True):
+    def query_dois(dois, workers=8, timeout=10, doi_url="https://doi.org", cache=None):
+        """Web query for many dois at once.
+
+        Queries run in a bounded pool of threads sharing one keep-alive session.
+
+        :param dois: list of reference dois
+        :type dois: list
+        :param workers: maximum number of concurrent queries
+        :type workers: int
+        :param timeout: seconds to wait for each response
+        :type timeout: float
+        :param doi_url: base URL of the DOI resolver
+        :type doi_url: str
+        :param cache: optional loaded response cache
+        :type cache: :class:`RefCache`
+        :return: list of bibtex dicts (or None for failed queries) in the order of ``dois``
+        :rtype: list
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        import requests
+
+        if len(dois) == 0:
+            return []
+        workers = max(1, min(workers, len(dois)))
+        with requests.Session() as session:
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=workers, pool_maxsize=workers
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                lst_bibs = list(
+                    executor.map(
+                        lambda doi: Ref.query_doi(
+                            doi=doi,
+                            timeout=timeout,
+                            session=session,
+                            doi_url=doi_url,
+                            cache=cache,
+                        ),
+                        dois,
+                    )
+                )
+        return lst_bibs
+
+    @staticmethod
+    def query_xref(search_query, include_refs=True, workers=8, timeout=10, cache=None):
         """Queries a cross-reference service and extracts BibTeX entries from the search results.
 
         :param search_query: The query string to search for.
         :type search_query: str
         :param include_refs: Whether to include references in the search results.
         :type include_refs: bool
+        :param workers: Maximum number of concurrent DOI queries for the references.
+        :type workers: int
+        :param timeout: Seconds to wait for each DOI query of the references.
+        :type timeout: float
+        :param cache: Optional loaded response cache, also used for the references.
+        :type cache: :class:`RefCache`
         :return: A list of dictionaries containing BibTeX entries.
         :rtype: list
         """
+        import requests
 
         def extract_bibtex_entry(data):
             # Handle authors
@@ -1397,38 +1689,42 @@ class Ref(MbaE):
                         break
                 return citation_doi
 
-            lst_references = []
-            for i in range(len(data["items"][0]["reference"])):
-
+            lst_items = data["items"][0]["reference"]
+            lst_dois = []
+            for item in lst_items:
                 # handle DOI
-                if "DOI" in data["items"][0]["reference"][i]:
-                    known_doi = data["items"][0]["reference"][i]["DOI"]
-
-                elif "unstructured" in data["items"][0]["reference"][i]:
+                if "DOI" in item:
+                    known_doi = item["DOI"]
+                elif "unstructured" in item:
                     # try to find in the text
-                    citation = data["items"][0]["reference"][i]["unstructured"]
-                    known_doi = find_doi(citation)
+                    known_doi = find_doi(item["unstructured"])
                 else:
                     known_doi = None
+                lst_dois.append(known_doi)
+
+            # resolve all known DOIs at once
+            lst_known = list(dict.fromkeys(doi for doi in lst_dois if doi))
+            dct_bibs = dict(
+                zip(
+                    lst_known,
+                    Ref.query_dois(
+                        dois=lst_known, workers=workers, timeout=timeout, cache=cache
+                    ),
+                )
+            )
 
+            lst_references = []
+            for item, known_doi in zip(lst_items, lst_dois):
                 # Handle text
-                if known_doi:
-                    # print(f">>>> DOI is known: {known_doi}")
-                    ref_bib_dict = Ref.query_doi(doi=known_doi)
+                ref_bib_dict = dct_bibs.get(known_doi) if known_doi else None
+                if ref_bib_dict:
                     # get citation
                     citation_formatted = Ref.cite_full(
                         bib_dict=ref_bib_dict, text_format="md"
                     )
-
-                    # print(f">>>> {citation_formatted}")
                     lst_references.append(citation_formatted)
-                elif "unstructured" in data["items"][0]["reference"][i]:
-                    citation_formatted = data["items"][0]["reference"][i][
-                        "unstructured"
-                    ]
-                    lst_references.append(citation_formatted)
-
-                    # print(f">>>> {citation_formatted}")
+                elif "unstructured" in item:
+                    lst_references.append(item["unstructured"])
                 else:
                     pass
             # sort by name
@@ -1440,17 +1736,31 @@ class Ref(MbaE):
         # CrossRef API search URL
         search_url = f'https://api.crossref.org/works?query.bibliographic="{search_query}"&rows=2'
         output_data = None
+        cache_key = f"xref:{search_query}"
 
         try:
-            response = requests.get(search_url, timeout=2)
+            cached = None
+            if cache is not None:
+                cached = cache.get(key=cache_key)
+            if cached is not None:
+                response_text = cached[0]
+            elif cache is not None and cache.offline:
+                return None
+            else:
+                response = requests.get(search_url, timeout=2)
+                response_text = None
+                if response.status_code == 200:  # json code
+                    print(">>> got response")
+                    response_text = response.text
 
             # Handle response
-            if response.status_code == 200:  # json code
-                print(">>> got response")
-                data = response.json().get("message", {})
+            if response_text is not None:
+                data = json.loads(response_text).get("message", {})
                 print(">>> got data")
                 # handle main bibtex:
                 main_bib = extract_bibtex_entry(data=data["items"][0])
+                if cache is not None and cached is None:
+                    cache.put(key=cache_key, raw=response_text, parsed=main_bib)
                 # handle references
                 lst_references = None
                 if include_refs:
@@ -1500,41 +1810,145 @@ class Ref(MbaE):
 
     @staticmethod
     def add_bat(
-        src_folder, lib_folder, template_folder, tags=None, related=None, clean=False
+        src_folder,
+        lib_folder,
+        template_folder,
+        tags=None,
+        related=None,
+        clean=False,
+        workers=None,
+        pairs=None,
+        errors=None,
     ):
+        """Adds all pairs of ``bib`` and ``pdf`` files of a folder to the library.
+
+        With ``workers`` the pairs run through a staged pipeline: the ``bib``
+        files are loaded and the citation keys allocated one at a time, in
+        file name order, while PDF copying and note rendering run in a thread
+        pool and cover rendering (books and reports) in a process pool.
+
+        A failed pair does not stop the batch: every other pair is added (and
+        cleaned) and the key registry is saved before the failures are reported.
+
+        :param src_folder: path to the folder with the ``bib`` and ``pdf`` pairs
+        :type src_folder: str
+        :param lib_folder: path to the library folder
+        :type lib_folder: str
+        :param template_folder: path to the folder of the note templates
+        :type template_folder: str
+        :param tags: Optional tags associated with the references.
+        :type tags: list or None
+        :param related: Optional related items (not used).
+        :type related: list or None
+        :param clean: option to remove the source files once added
+        :type clean: bool
+        :param workers: number of pipeline workers. Default None (one pair at a time)
+        :type workers: int or None
+        :param pairs: Optional pairs of ``bib`` and ``pdf`` file names to add
+            (see :meth:`catalog_files`). Default None (all pairs in the folder)
+        :type pairs: list or None
+        :param errors: Optional dictionary filled with the failed pairs and their
+            exceptions. Default None (the first failure is raised once the batch is done)
+        :type errors: dict or None
+        :return: throughput of each stage (only with ``workers``)
+        :rtype: dict or None
+        """
 
         # 1) list the pairs of pdfs and bib files
-        lst_files = Ref.catalog_files(folder_path=src_folder)
+        if pairs is None:
+            pairs = Ref.catalog_files(folder_path=src_folder)
+        lst_files = sorted(pairs)
+
+        # load the citation keys of the library once
+        registry = RefKeys(lib_folder=lib_folder)
+        registry.load()
+
+        dc_errors = {}
+        dc_stages = None
+        try:
+            if workers is not None and workers > 1:
+                dc_stages = Ref._add_bat_pipeline(
+                    src_folder=src_folder,
+                    lst_files=lst_files,
+                    lib_folder=lib_folder,
+                    template_folder=template_folder,
+                    tags=tags,
+                    registry=registry,
+                    clean=clean,
+                    workers=workers,
+                    errors=dc_errors,
+                )
+            else:
+                Ref._add_bat_sequential(
+                    src_folder=src_folder,
+                    lst_files=lst_files,
+                    lib_folder=lib_folder,
+                    template_folder=template_folder,
+                    tags=tags,
+                    registry=registry,
+                    clean=clean,
+                    errors=dc_errors,
+                )
+        finally:
+            # persist reserved keys
+            registry.save()
+
+        for pair in dc_errors:
+            e = dc_errors[pair]
+            print(f"--- failed: {pair[0]}: {type(e).__name__}: {e}")
+        if errors is not None:
+            errors.update(dc_errors)
+        elif dc_errors:
+            raise next(iter(dc_errors.values()))
+        return dc_stages
+
+    @staticmethod
+    def _add_bat_sequential(
+        src_folder,
+        lst_files,
+        lib_folder,
+        template_folder,
+        tags,
+        registry,
+        clean,
+        errors,
+    ):
+        """One pair at a time path of :meth:`add_bat`.
 
+        :return: None
+        :rtype: None
+        """
         # 2) for each pair, move it to the library folder
         for pair in lst_files:
-            src_bib_file = "{}/{}".format(src_folder, pair[0])
-            src_pdf_file = "{}/{}".format(src_folder, pair[1])
+            try:
+                src_bib_file = "{}/{}".format(src_folder, pair[0])
+                src_pdf_file = "{}/{}".format(src_folder, pair[1])
 
-            # 3) handle the type of reference
-            r = Ref()
-            r.file_bib = src_bib_file
-            r.file_doc = src_pdf_file
-            r.load_bib(order=0)  # always the first
+                # 3) handle the type of reference
+                r = Ref()
+                r.file_bib = src_bib_file
+                r.file_doc = src_pdf_file
+                r.load_bib(order=0)  # always the first
 
-            # 4) get the note template file
-            n = RefNote()
-            note_template_file = "{}/{}".format(
-                template_folder, n.template_filenames[r.entry_type]
-            )
-            # remove the note object
-            del n
+                # 4) get the note template file
+                note_template_file = "{}/{}".format(
+                    template_folder, RefNote.template_filenames[r.entry_type]
+                )
 
-            # 5) call the add to lib
-            r.add_to_lib(
-                lib_folder=lib_folder,
-                note_template=note_template_file,
-                tags=tags,
-                related=None,
-                comments=None,
-                pdf_name=None,
-                note_name=None,
-            )
+                # 5) call the add to lib
+                r.add_to_lib(
+                    lib_folder=lib_folder,
+                    note_template=note_template_file,
+                    tags=tags,
+                    related=None,
+                    comments=None,
+                    pdf_name=None,
+                    note_name=None,
+                    registry=registry,
+                )
+            except Exception as e:
+                errors[pair] = e
+                continue
 
             # 6) clean-up
             if clean:
@@ -1542,31 +1956,826 @@ class Ref(MbaE):
                 os.remove(src_pdf_file)
         return None
 
+    @staticmethod
+    def _add_bat_pipeline(
+        src_folder,
+        lst_files,
+        lib_folder,
+        template_folder,
+        tags,
+        registry,
+        clean,
+        workers,
+        errors,
+    ):
+        """Staged pipeline of :meth:`add_bat`.
+
+        :return: dictionary of stages with ``count``, ``seconds`` (wall time
+            from the first start to the last end) and ``rate`` (items per second)
+        :rtype: dict
+        """
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        dc_times = {"prepare": [], "copy": [], "note": [], "cover": []}
+
+        def copy_pdf(src_pdf, dst_pdf, b_cover):
+            t0 = time.perf_counter()
+            shutil.copy(src=src_pdf, dst=dst_pdf)
+            print(f"--- Added PDF file: {dst_pdf}")
+            t1 = time.perf_counter()
+            # covers need the copied pdf: hand it over right away
+            f_cover = None
+            if b_cover:
+                f_cover = processes.submit(Ref._render_cover, dst_pdf)
+            return t0, t1, f_cover
+
+        def render_note(r, note_template, name):
+            t0 = time.perf_counter()
+            o = r.to_note(
+                output_dir=lib_folder,
+                note_template=note_template,
+                filename=name,
+                tags=tags,
+                related=None,
+                body=None,
+                pdf_name=name,
+            )
+            print(f"--- Added Markdown note: {o}")
+            return t0, time.perf_counter(), o
+
+        lst_jobs = []
+        # covers are cpu bound: no more processes than cores
+        n_processes = min(workers, os.cpu_count() or 1)
+        # cover processes start from the copy threads: never fork a threaded process
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            mp_context = multiprocessing.get_context("forkserver")
+        else:
+            mp_context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=n_processes, mp_context=mp_context
+        ) as processes:
+            with ThreadPoolExecutor(max_workers=workers) as threads:
+                # 1) serial stage: load and allocate keys in a fixed order
+                for pair in lst_files:
+                    t0 = time.perf_counter()
+                    src_bib_file = "{}/{}".format(src_folder, pair[0])
+                    src_pdf_file = "{}/{}".format(src_folder, pair[1])
+                    try:
+                        r = Ref()
+                        r.file_bib = src_bib_file
+                        r.file_doc = src_pdf_file
+                        r.load_bib(order=0)  # always the first
+                        note_template_file = "{}/{}".format(
+                            template_folder, RefNote.template_filenames[r.entry_type]
+                        )
+                        r.lib_folder = lib_folder
+                        r.standardize(registry=registry)
+                        name = r.get_lib_name()
+                    except Exception as e:
+                        errors[pair] = e
+                        continue
+                    dst_pdf = "{}/{}.pdf".format(lib_folder, name)
+                    dc_times["prepare"].append((t0, time.perf_counter()))
+
+                    # 2) concurrent stages
+                    b_cover = r.bib_dict["entry_type"] in ["book", "techreport"]
+                    f_copy = threads.submit(copy_pdf, src_pdf_file, dst_pdf, b_cover)
+                    f_note = threads.submit(render_note, r, note_template_file, name)
+                    lst_jobs.append((pair, src_bib_file, src_pdf_file, f_copy, f_note))
+
+                # 3) collect every outcome: a failure does not stop the others
+                lst_covers = []
+                for pair, src_bib_file, src_pdf_file, f_copy, f_note in lst_jobs:
+                    try:
+                        t0, t1, f_cover = f_copy.result()
+                        dc_times["copy"].append((t0, t1))
+                        if f_cover is not None:
+                            lst_covers.append((pair, f_cover))
+                        t0, t1, o = f_note.result()
+                        dc_times["note"].append((t0, t1))
+                    except Exception as e:
+                        errors[pair] = e
+                        continue
+                    # clean-up once the pair is in the library
+                    if clean:
+                        os.remove(src_bib_file)
+                        os.remove(src_pdf_file)
+
+                for pair, f_cover in lst_covers:
+                    try:
+                        t0, t1, im = f_cover.result()
+                    except Exception as e:
+                        errors[pair] = e
+                        continue
+                    dc_times["cover"].append((t0, t1))
+                    print(f"--- Added cover file: {im}")
+
+        # throughput report
+        dc_stages = {}
+        for stage in dc_times:
+            lst_times = dc_times[stage]
+            if len(lst_times) == 0:
+                continue
+            seconds = max(t[1] for t in lst_times) - min(t[0] for t in lst_times)
+            dc_stages[stage] = {
+                "count": len(lst_times),
+                "seconds": seconds,
+                "rate": len(lst_times) / seconds if seconds > 0 else float("inf"),
+            }
+            print(
+                "--- stage {:<8} {:>6} items {:>9.3f} s {:>10.1f} /s".format(
+                    stage, len(lst_times), seconds, dc_stages[stage]["rate"]
+                )
+            )
+        return dc_stages
+
+    @staticmethod
+    def _render_cover(file_pdf):
+        """Render the cover of a PDF in a worker process (PyMuPDF is not thread-safe).
+
+        :return: start and end ``perf_counter`` marks and the image file
+        :rtype: tuple
+        """
+        t0 = time.perf_counter()
+        im = RefNote.get_cover_image(file_path=file_pdf)
+        return t0, time.perf_counter(), im
+
     @staticmethod
     def catalog_files(folder_path):
-        # Get all files in the folder
-        all_files = os.listdir(folder_path)
+        """Get the pairs of ``bib`` and ``pdf`` files of a folder.
+
+        :param folder_path: path to the folder
+        :type folder_path: str
+        :return: pairs of ``bib`` and ``pdf`` file names (same name, any extension case)
+        :rtype: list
+        """
+        for rel_dir, pairs, orphans in Ref.iter_catalog(folder_path, recursive=False):
+            return pairs
+        return []
+
+    @staticmethod
+    def iter_catalog(folder_path, recursive=True):
+        """Walk a folder and yield the ``bib`` and ``pdf`` files of each directory.
+
+        Each directory is listed once with ``os.scandir`` and its results are
+        yielded right away, before the subdirectories are listed. A ``bib`` and a
+        ``pdf`` file pair up by name, with extensions in any case.
+        Subdirectories starting with ``_`` or ``.`` and symbolic links to
+        directories are skipped.
+
+        :param folder_path: path to the folder
+        :type folder_path: str
+        :param recursive: option to walk the subdirectories, defaults to True
+        :type recursive: bool
+        :return: iterator of ``(rel_dir, pairs, orphans)`` for each directory: the
+            directory path relative to ``folder_path`` (``""`` for the folder itself),
+            the pairs of ``bib`` and ``pdf`` files and the list of unpaired ``bib``
+            and ``pdf`` files (file paths relative to ``folder_path``)
+        :rtype: iterator
+        """
+        stack = [""]
+        while stack:
+            rel_dir = stack.pop()
+            prefix = rel_dir + os.sep if rel_dir else ""
+            dc_bib = {}
+            dc_pdf = {}
+            lst_dirs = []
+            with os.scandir(os.path.join(folder_path, rel_dir)) as entries:
+                for e in entries:
+                    name = e.name
+                    ext = name[-4:].lower()
+                    if ext in (".bib", ".pdf") and e.is_file():
+                        if ext == ".bib":
+                            dc_bib[name[:-4]] = prefix + name
+                        else:
+                            dc_pdf[name[:-4]] = prefix + name
+                    elif (
+                        recursive
+                        and name[0] not in "_."
+                        and e.is_dir(follow_symlinks=False)
+                    ):
+                        # linked directories are not walked (no symlink loops)
+                        lst_dirs.append(prefix + name)
+            pairs = [(dc_bib[k], dc_pdf[k]) for k in sorted(dc_bib) if k in dc_pdf]
+            orphans = sorted(
+                [dc_bib[k] for k in dc_bib if k not in dc_pdf]
+                + [dc_pdf[k] for k in dc_pdf if k not in dc_bib]
+            )
+            yield rel_dir, pairs, orphans
+            # walk the subdirectories in name order
+            stack.extend(sorted(lst_dirs, reverse=True))
+
+
+class RefCache(MbaE):
+    """
+    A persistent cache of web responses (DOI and Crossref queries).
+
+    Responses are kept in a SQLite file (by default ``_cache.sqlite`` in the library folder),
+    keyed by the query, along with the parsed BibTeX dictionary.
+    Failed queries are kept as negative entries, with a shorter time to live.
+
+    **Examples:**
+
+    .. code-block:: python
+
+        cache = RefCache(lib_folder="path/to/library", ttl=30 * 86400)
+        cache.load()
+
+        # first call goes to the web, the next ones are served from disk
+        bib_dict = Ref.query_doi(doi="10.1016/0022-1694(89)90101-7", cache=cache)
+
+        # serve only from the cache
+        cache.offline = True
 
-        # Separate files by extensions
-        bib_files = set(f for f in all_files if f.endswith(".bib"))
-        pdf_files = set(f for f in all_files if f.endswith(".pdf"))
+    """
 
-        # Find valid pairs
-        valid_pairs = []
-        for bib_file in bib_files:
-            # Strip the extension to match file names
-            base_name = os.path.splitext(bib_file)[0]
-            pdf_file = f"{base_name}.pdf"
+    # Attribute fields
+    file_cache_field = "file_cache"
+    ttl_field = "ttl"
+    negative_ttl_field = "negative_ttl"
+    max_size_field = "max_size"
+    offline_field = "offline"
 
-            # Check if the corresponding PDF exists
-            if pdf_file in pdf_files:
-                valid_pairs.append((bib_file, pdf_file))
+    def __init__(
+        self,
+        lib_folder=None,
+        file_cache=None,
+        ttl=30 * 86400,
+        negative_ttl=86400,
+        max_size=100000,
+        offline=False,
+        name="MyRefCache",
+        alias="RCache",
+    ):
+        """Initialize the ``RefCache`` object.
 
-        return valid_pairs
+        :param lib_folder: path to the library folder holding the cache file
+        :type lib_folder: str
+        :param file_cache: path to the cache file. Default is ``_cache.sqlite`` in ``lib_folder``
+        :type file_cache: str
+        :param ttl: time to live of entries in seconds. None for no expiration
+        :type ttl: float
+        :param negative_ttl: time to live of negative entries in seconds. None for no expiration
+        :type negative_ttl: float
+        :param max_size: maximum number of entries. Least recently used entries are dropped first
+        :type max_size: int
+        :param offline: option for serving only from the cache, including expired entries
+        :type offline: bool
+        """
+        super().__init__(name=name, alias=alias)
+        if file_cache is None and lib_folder is not None:
+            file_cache = os.path.join(lib_folder, "_cache.sqlite")
+        self.file_cache = file_cache
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self.offline = offline
+        self.connection = None
+        # running number of entries, counted once on load
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def get_metadata(self):
+        """Get a dictionary with object metadata.
+        Expected to increment superior methods.
+
+        :return: dictionary with all metadata
+        :rtype: dict
+        """
+        dict_meta = super().get_metadata()
+        dict_meta[self.file_cache_field] = self.file_cache
+        dict_meta[self.ttl_field] = self.ttl
+        dict_meta[self.negative_ttl_field] = self.negative_ttl
+        dict_meta[self.max_size_field] = self.max_size
+        dict_meta[self.offline_field] = self.offline
+        return dict_meta
+
+    def load(self):
+        """Open (or create) the cache file.
+
+        :return: None
+        :rtype: None
+        """
+        self.connection = sqlite3.connect(self.file_cache, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, raw TEXT, parsed TEXT, created REAL, accessed REAL)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+        )
+        self.connection.commit()
+        self.size = self.connection.execute(
+            "SELECT COUNT(*) FROM responses"
+        ).fetchone()[0]
+        return None
+
+    def close(self):
+        """Close the cache file.
+
+        :return: None
+        :rtype: None
+        """
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+        return None
+
+    def get(self, key):
+        """Get a cached response.
+
+        :param key: query key
+        :type key: str
+        :return: tuple of raw response text and parsed dictionary (both None for a
+            negative entry), or None if missing or expired
+        :rtype: tuple or None
+        """
+        now = time.time()
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT raw, parsed, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            raw, parsed, created = row
+            ttl = self.ttl if raw is not None else self.negative_ttl
+            if ttl is not None and now - created > ttl and not self.offline:
+                return None
+            self.connection.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+            self.connection.commit()
+        return raw, json.loads(parsed)
+
+    def put(self, key, raw, parsed):
+        """Store a response.
+
+        :param key: query key
+        :type key: str
+        :param raw: raw response text. None for a negative entry (failed query)
+        :type raw: str
+        :param parsed: parsed dictionary of the response. None for a negative entry
+        :type parsed: dict
+        :return: None
+        :rtype: None
+        """
+        now = time.time()
+        with self.lock:
+            is_new = (
+                self.connection.execute(
+                    "SELECT 1 FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                is None
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, raw, json.dumps(parsed), now, now),
+            )
+            if is_new:
+                self.size = self.size + 1
+            # drop least recently used entries
+            if self.max_size is not None and self.size > self.max_size:
+                cursor = self.connection.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY accessed LIMIT ?)",
+                    (self.size - self.max_size,),
+                )
+                self.size = self.size - cursor.rowcount
+            self.connection.commit()
+        return None
+
+    def clear(self):
+        """Drop all entries.
+
+        :return: None
+        :rtype: None
+        """
+        with self.lock:
+            self.connection.execute("DELETE FROM responses")
+            self.connection.commit()
+            self.size = 0
+        return None
+
+
+class RefKeys(MbaE):
+    """
+    A registry of the citation keys taken in a library folder.
+
+    The keys are held in a set and persisted to ``_keys.txt`` in the library folder,
+    so batch ingestion checks and reserves keys in constant time instead of
+    listing the library for every new reference.
+
+    **Examples:**
+
+    .. code-block:: python
+
+        # load the registry once
+        reg = RefKeys(lib_folder="path/to/library")
+        reg.load()
+
+        # standardize references against it
+        r.standardize(registry=reg)
+
+        # persist reserved keys
+        reg.save()
+
+    """
+
+    # Attribute fields
+    lib_folder_field = "lib_folder"
+    size_field = "Size"
+
+    def __init__(self, lib_folder=None, name="MyRefKeys", alias="RKeys"):
+        super().__init__(name=name, alias=alias)
+        self.lib_folder = lib_folder
+        self.file_registry = None
+        if lib_folder is not None:
+            self.file_registry = os.path.join(lib_folder, "_keys.txt")
+        self.keys = set()
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def __len__(self):
+        return len(self.keys)
+
+    def get_metadata(self):
+        """Get a dictionary with object metadata.
+        Expected to increment superior methods.
+
+        :return: dictionary with all metadata
+        :rtype: dict
+        """
+        dict_meta = super().get_metadata()
+        dict_meta[self.lib_folder_field] = self.lib_folder
+        dict_meta[self.size_field] = len(self.keys)
+        return dict_meta
+
+    def load(self):
+        """Load the registry from the library folder.
+
+        The library folder is listed only when the registry file is missing
+        or older than the folder (notes added or removed by other means).
+
+        :return: None
+        :rtype: None
+        """
+        is_fresh = False
+        if os.path.isfile(self.file_registry):
+            is_fresh = os.path.getmtime(self.file_registry) >= os.path.getmtime(
+                self.lib_folder
+            )
+        if is_fresh:
+            with open(self.file_registry, "r", encoding="utf-8") as file:
+                self.keys = set(line.strip() for line in file if line.strip())
+        else:
+            # the folder listing alone: keys of removed notes are dropped
+            self.keys = set(Ref.get_citation_keys(lib_folder=self.lib_folder))
+        return None
+
+    def save(self):
+        """Persist the registry to the library folder.
+
+        :return: None
+        :rtype: None
+        """
+        with open(self.file_registry, "w", encoding="utf-8") as file:
+            file.writelines(f"{k}\n" for k in sorted(self.keys))
+        return None
+
+    def reserve(self, key):
+        """Mark a citation key as taken.
+
+        :param key: citation key
+        :type key: str
+        :return: None
+        :rtype: None
+        """
+        self.keys.add(key)
+        return None
+
+    def release(self, key):
+        """Mark a citation key as free again.
+
+        :param key: citation key
+        :type key: str
+        :return: None
+        :rtype: None
+        """
+        self.keys.discard(key)
+        return None
+
+
+class RefNoteCache(MbaE):
+    """
+    A warm-start cache of the parsed notes of a library folder.
+
+    The output of :meth:`RefNote.scan_note` for each note is pickled to
+    ``_notes.pkl`` in the library folder, keyed by file name and checked
+    against the file modification time and size, so only new or changed
+    notes are parsed again.
+
+    **Examples:**
+
+    .. code-block:: python
+
+        cache = RefNoteCache(lib_folder="path/to/library")
+        cache.load()
+        scan = cache.scan(file_path="path/to/library/note.md")
+        cache.save()
+
+    """
+
+    # Attribute fields
+    lib_folder_field = "lib_folder"
+    size_field = "Size"
+
+    version = 1
+
+    def __init__(self, lib_folder=None, name="MyRefNoteCache", alias="RNCache"):
+        super().__init__(name=name, alias=alias)
+        self.lib_folder = lib_folder
+        self.file_cache = None
+        if lib_folder is not None:
+            self.file_cache = os.path.join(lib_folder, "_notes.pkl")
+        # file name: (mtime, size, scan)
+        self.entries = {}
+        self.is_changed = False
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get_metadata(self):
+        """Get a dictionary with object metadata.
+        Expected to increment superior methods.
+
+        :return: dictionary with all metadata
+        :rtype: dict
+        """
+        dict_meta = super().get_metadata()
+        dict_meta[self.lib_folder_field] = self.lib_folder
+        dict_meta[self.size_field] = len(self.entries)
+        return dict_meta
+
+    def load(self):
+        """Load the cache from the library folder.
+
+        A missing, unreadable or outdated cache file starts an empty cache.
+
+        :return: None
+        :rtype: None
+        """
+        import pickle
+
+        self.entries = {}
+        self.is_changed = False
+        if os.path.isfile(self.file_cache):
+            try:
+                with open(self.file_cache, "rb") as file:
+                    dc = pickle.load(file)
+                if dc.get("version") == self.version:
+                    self.entries = dc["entries"]
+            except Exception:
+                self.is_changed = True
+        return None
+
+    def save(self):
+        """Persist the cache to the library folder (only if it changed).
+
+        :return: None
+        :rtype: None
+        """
+        import pickle
+
+        if not self.is_changed:
+            return None
+        file_tmp = self.file_cache + ".tmp"
+        with open(file_tmp, "wb") as file:
+            pickle.dump(
+                {"version": self.version, "entries": self.entries},
+                file,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(file_tmp, self.file_cache)
+        self.is_changed = False
+        return None
+
+    def scan(self, file_path, stat=None):
+        """Get the scan of a note, parsing it only if new or changed.
+
+        :param file_path: path to the note file in the library folder
+        :type file_path: str
+        :param stat: Optional ``os.stat`` result of the file
+        :type stat: :class:`os.stat_result` or None
+        :return: output of :meth:`RefNote.scan_note`
+        :rtype: dict
+        """
+        if stat is None:
+            stat = os.stat(file_path)
+        key = os.path.basename(file_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        entry = self.entries.get(key)
+        if entry is not None and entry[:2] == signature:
+            return entry[2]
+        scan = RefNote.scan_note(file_path)
+        self.entries[key] = signature + (scan,)
+        self.is_changed = True
+        return scan
+
+    def prune(self, names):
+        """Drop the entries of files that are gone.
+
+        :param names: file names currently in the library folder
+        :type names: set
+        :return: None
+        :rtype: None
+        """
+        ls_gone = [k for k in self.entries if k not in names]
+        for k in ls_gone:
+            del self.entries[k]
+        if ls_gone:
+            self.is_changed = True
+        return None
+
+
+class RefManifest(MbaE):
+    """
+    A content-hash manifest of the rendered notes of a library folder.
+
+    For each note, the hash of the file content as last rendered is persisted
+    to ``_manifest.json`` in the library folder, together with the
+    :attr:`RefNote.renderer_version` that rendered it. A note is refreshed
+    again only if its content changed since, or if the renderer did.
+
+    **Examples:**
+
+    .. code-block:: python
+
+        manifest = RefManifest(lib_folder="path/to/library")
+        manifest.load()
+        if not manifest.is_current(file_path="path/to/library/note.md"):
+            # ... update and save the note
+            manifest.record(file_path="path/to/library/note.md")
+        manifest.save()
+
+    """
+
+    # Attribute fields
+    lib_folder_field = "lib_folder"
+    size_field = "Size"
+    version_field = "renderer_version"
+
+    def __init__(
+        self, lib_folder=None, version=None, name="MyRefManifest", alias="RMnf"
+    ):
+        super().__init__(name=name, alias=alias)
+        self.lib_folder = lib_folder
+        self.version = RefNote.renderer_version if version is None else version
+        self.file_manifest = None
+        if lib_folder is not None:
+            self.file_manifest = os.path.join(lib_folder, "_manifest.json")
+        # file name: content hash
+        self.entries = {}
+        self.is_changed = False
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get_metadata(self):
+        """Get a dictionary with object metadata.
+        Expected to increment superior methods.
+
+        :return: dictionary with all metadata
+        :rtype: dict
+        """
+        dict_meta = super().get_metadata()
+        dict_meta[self.lib_folder_field] = self.lib_folder
+        dict_meta[self.version_field] = self.version
+        dict_meta[self.size_field] = len(self.entries)
+        return dict_meta
+
+    def load(self):
+        """Load the manifest from the library folder.
+
+        A missing or unreadable manifest, or one written by another renderer
+        version, starts an empty manifest (all notes are refreshed).
+
+        :return: None
+        :rtype: None
+        """
+        self.entries = {}
+        self.is_changed = False
+        if os.path.isfile(self.file_manifest):
+            try:
+                with open(self.file_manifest, "r", encoding="utf-8") as file:
+                    dc = json.load(file)
+                if dc.get(self.version_field) == self.version:
+                    self.entries = dc["entries"]
+                else:
+                    self.is_changed = True
+            except Exception:
+                self.is_changed = True
+        return None
+
+    def save(self):
+        """Persist the manifest to the library folder (only if it changed).
+
+        :return: None
+        :rtype: None
+        """
+        if not self.is_changed:
+            return None
+        file_tmp = self.file_manifest + ".tmp"
+        with open(file_tmp, "w", encoding="utf-8") as file:
+            json.dump(
+                {self.version_field: self.version, "entries": self.entries},
+                file,
+                indent=1,
+                sort_keys=True,
+            )
+        os.replace(file_tmp, self.file_manifest)
+        self.is_changed = False
+        return None
+
+    def is_current(self, file_path):
+        """Check if a note is unchanged since it was last recorded.
+
+        :param file_path: path to the note file in the library folder
+        :type file_path: str
+        :return: True if the note content matches the manifest
+        :rtype: bool
+        """
+        digest = self.entries.get(os.path.basename(file_path))
+        if digest is None:
+            return False
+        return RefManifest.hash_file(file_path) == digest
+
+    def record(self, file_path):
+        """Record the current content of a note.
+
+        :param file_path: path to the note file in the library folder
+        :type file_path: str
+        :return: None
+        :rtype: None
+        """
+        key = os.path.basename(file_path)
+        digest = RefManifest.hash_file(file_path)
+        if self.entries.get(key) != digest:
+            self.entries[key] = digest
+            self.is_changed = True
+        return None
+
+    def prune(self, names):
+        """Drop the entries of files that are gone.
+
+        :param names: file names currently in the library folder
+        :type names: set
+        :return: None
+        :rtype: None
+        """
+        ls_gone = [k for k in self.entries if k not in names]
+        for k in ls_gone:
+            del self.entries[k]
+        if ls_gone:
+            self.is_changed = True
+        return None
+
+    @staticmethod
+    def hash_file(file_path):
+        """Get the content hash of a file.
+
+        :param file_path: path to file
+        :type file_path: str
+        :return: hexadecimal SHA-1 digest of the file bytes
+        :rtype: str
+        """
+        import hashlib
+
+        with open(file_path, "rb") as file:
+            return hashlib.sha1(file.read()).hexdigest()
 
 
 class RefNote(Note):
 
+    # Expected filename for each template:
+    template_filenames = {
+        "article": "_paper.md",
+        "book": "_book.md",
+        "techreport": "_techreport.md",
+        "misc": "_misc.md",
+        "thesis": "_thesis.md",
+        "dataset": "_dataset.md",
+    }
+
+    # version of the rendered head, tail and layout of the notes:
+    # increment when their output changes (see :class:`RefManifest`)
+    renderer_version = 1
+
+    # parsed templates by path: (mtime, size, metadata, data)
+    _template_cache = {}
+    _template_lock = threading.Lock()
+
     def __init__(self, name="MyRefNote", alias="RNt1"):
         super().__init__(name=name, alias=alias)
         # ---
@@ -1699,16 +2908,6 @@ class RefNote(Note):
             ],
         }
 
-        # Expected filename for each template:
-        self.template_filenames = {
-            "article": "_paper.md",
-            "book": "_book.md",
-            "techreport": "_techreport.md",
-            "misc": "_misc.md",
-            "thesis": "_thesis.md",
-            "dataset": "_dataset.md",
-        }
-
         self.nonbib_fields = {
             "article": ["tags", "timestamp", "file", "citation_in", "credit"],
             "book": ["tags", "timestamp", "file", "citation_in", "credit"],
@@ -1735,6 +2934,39 @@ class RefNote(Note):
         super().load_metadata()
         self._standardize_metatada()
 
+    @staticmethod
+    def load_template(file_template):
+        """Get a new note loaded from a template file.
+
+        The template is parsed once and kept in memory until the file changes
+        (by modification time and size); each call gets its own copy.
+
+        :param file_template: path to the template markdown file
+        :type file_template: str
+        :return: note with the template metadata and data
+        :rtype: :class:`RefNote`
+        """
+        st = os.stat(file_template)
+        with RefNote._template_lock:
+            cached = RefNote._template_cache.get(file_template)
+        if cached is None or cached[:2] != (st.st_mtime_ns, st.st_size):
+            n = RefNote()
+            n.file_note = file_template
+            n.load()
+            cached = (st.st_mtime_ns, st.st_size, n.metadata, n.data)
+            with RefNote._template_lock:
+                RefNote._template_cache[file_template] = cached
+
+        # values are strings or lists of strings: copying the lists
+        # is a deep copy (and much cheaper than copy.deepcopy)
+        n = RefNote()
+        n.file_note = file_template
+        n.metadata = {
+            k: v[:] if isinstance(v, list) else v for k, v in cached[2].items()
+        }
+        n.data = {k: v[:] for k, v in cached[3].items()}
+        return n
+
     def _standardize_metatada(self):
         """Standardizes the metadata for the current reference.
 
@@ -2070,47 +3302,45 @@ class RefNote(Note):
         :return:
         :rtype:
         """
+        # the first entry in the note
         with open(file_path, "r", encoding="utf-8") as file:
-            lines = file.readlines()
-
-        bibtex_dict = {}
-        entry_type = ""
-        citation_key = ""
-        in_bibtex = False
-        bibtex_lines = []
-
-        for line in lines:
-            if line.strip().startswith("@"):
-                in_bibtex = True
-                entry_type, rest = line.strip()[1:].split("{", 1)
-                citation_key, rest = rest.split(",", 1)
-                bibtex_lines.append(rest.strip())
-            elif in_bibtex:
-                bibtex_lines.append(line.strip())
-                if line.strip().endswith("}}"):
-                    break
-
-        if not in_bibtex:
-            return None
-
-        fields_raw = " ".join(bibtex_lines).rstrip("}}").strip()
-        fields_raw = re.sub(r",\s*}", "}", fields_raw)
-        fields_raw += ","
+            for bibtex_dict in Ref.scan_bibtex(lines=file):
+                return bibtex_dict
+        return None
 
-        fields_pattern = re.compile(r"(\w+)\s*=\s*\{(.*?)\},", re.DOTALL)
-        fields = fields_pattern.findall(fields_raw)
+    @staticmethod
+    def scan_note(file_path):
+        """Read a RefNote file once and get all of its parts.
 
-        bibtex_dict = {
-            "entry_type": entry_type,
-            "citation_key": citation_key,
+        :param file_path: path to the note file
+        :type file_path: str
+        :return: dictionary with ``metadata`` (front matter), ``data``
+            (Head, Body and Tail), ``bib_dict`` (first BibTeX entry or None)
+            and ``citation_in`` (in-text citation block or None)
+        :rtype: dict
+        """
+        with open(file_path, "r", encoding="utf-8") as file:
+            content = file.read()
+        lines = content.splitlines(keepends=True)
+
+        # the first entry in the note: skip the lines before the first "@"
+        bib_dict = None
+        at = content.find("@")
+        if at >= 0:
+            n = content.count("\n", 0, at)
+            for bib_dict in Ref.scan_bibtex(lines=lines[n:]):
+                break
+
+        # "In-text citation:" or the "## In-text citation" heading
+        match = re.search(r"In-text citation:?\n```\n(.*?)\n```", content, re.DOTALL)
+
+        return {
+            "metadata": Note.parse_metadata_text(content),
+            "data": Note.parse_note_lines(lines),
+            "bib_dict": bib_dict,
+            "citation_in": match.group(1) if match else None,
         }
 
-        for field in fields:
-            key, value = field
-            bibtex_dict[key.strip()] = value.strip()
-
-        return bibtex_dict
-
     @staticmethod
     def get_intext_citation(file_path):
         """Extracts the in-text citation from a given file.
@@ -2160,8 +3390,10 @@ class RefNote(Note):
 
 class RefColl(Collection):  # todo docstring
 
-    def __init__(self, name="MyRefCollection", alias="myRefCol"):
-        super().__init__(base_object=Ref, name=name, alias=alias)
+    def __init__(self, name="MyRefCollection", alias="myRefCol", copy_objects=True):
+        super().__init__(
+            base_object=Ref, name=name, alias=alias, copy_objects=copy_objects
+        )
 
     def load(self, file_path):
         """Loads references from a BibTeX file and appends them to the instance.
@@ -2171,9 +3403,8 @@ class RefColl(Collection):  # todo docstring
         :return: None
         :rtype: None
         """
-        list_refs = Ref.parse_bibtex(file_path)
-        for i in range(len(list_refs)):
-            bib_dict = list_refs[i]
+        lst_refs = []
+        for bib_dict in Ref.iter_bibtex(file_path):
             rf = Ref(
                 entry_type=bib_dict["entry_type"],
                 title=bib_dict["title"],
@@ -2182,39 +3413,83 @@ class RefColl(Collection):  # todo docstring
                 citation_key=bib_dict["citation_key"],
             )
             rf.bib_dict = bib_dict.copy()
-            self.append(new_object=rf)
+            lst_refs.append(rf)
+        self.extend(objects=lst_refs, copy_objects=False)
 
-    def load_library(self, lib_folder, by="notes"):
+    def load_library(self, lib_folder, by="notes", cache=False, metadata_only=False):
         """ "Loads references from a library folder and appends them to the instance.
 
         :param lib_folder: The path to the library folder.
         :type lib_folder: str
         :param by: The method to load references by (default is "notes").
         :type by: str
+        :param cache: option to use the warm-start cache of parsed notes (see :class:`RefNoteCache`)
+        :type cache: bool
+        :param metadata_only: option to read only the front matter of the notes. References are
+            set from the note metadata, with no ``bib_dict`` and no note ``data``.
+            The cache is not used. Default is False
+        :type metadata_only: bool
         :return: None
         :rtype: None
         """
         if by == "notes":
-            ls_files = glob.glob(f"{lib_folder}/*.md")
+            # a single listing resolves both the notes and their PDFs
+            dc_entries = {
+                e.name: e for e in os.scandir(lib_folder) if not e.name.startswith(".")
+            }
+            set_pdfs = set(f for f in dc_entries if f.endswith(".pdf"))
+            ls_names = [f for f in dc_entries if f.endswith(".md")]
+            note_cache = None
+            if cache and not metadata_only:
+                note_cache = RefNoteCache(lib_folder=lib_folder)
+                note_cache.load()
+                note_cache.prune(names=set(ls_names))
             # loop in files
-            for f in ls_files:
-                # Extract BibTeX entry into a dictionary
-                bibtex_dict = RefNote.get_bib(f)
+            lst_refs = []
+            for name in ls_names:
+                f = os.path.join(lib_folder, name)
+                if metadata_only:
+                    # read only the front matter
+                    metadata = Note.parse_metadata(f)
+                    if not metadata or not metadata.get("citation_key"):
+                        # not a reference note
+                        continue
+                    scan = {"metadata": metadata, "data": None}
+                    bibtex_dict = None
+                    dc_source = {
+                        k: metadata.get(k) or ""
+                        for k in ["author", "year", "entry_type", "title"]
+                    }
+                    dc_source["citation_key"] = metadata["citation_key"]
+                else:
+                    # read the note once (or not at all if cached)
+                    if note_cache is None:
+                        scan = RefNote.scan_note(f)
+                    else:
+                        scan = note_cache.scan(f, stat=dc_entries[name].stat())
+                    # Extract BibTeX entry into a dictionary
+                    bibtex_dict = scan["bib_dict"]
+                    if bibtex_dict is None:
+                        # not a reference note
+                        continue
+                    dc_source = bibtex_dict
                 r = Ref()
                 setter = {
-                    r.author_field: bibtex_dict["author"],
-                    r.year_field: bibtex_dict["year"],
-                    r.type_field: bibtex_dict["entry_type"],
-                    r.citation_key_field: bibtex_dict["citation_key"],
-                    r.title_field: bibtex_dict["title"],
+                    r.author_field: dc_source["author"],
+                    r.year_field: dc_source["year"],
+                    r.type_field: dc_source["entry_type"],
+                    r.citation_key_field: dc_source["citation_key"],
+                    r.title_field: dc_source["title"],
                 }
                 r.set(dict_setter=setter)
-                r.bib_dict = bibtex_dict.copy()
+                if bibtex_dict is not None:
+                    r.bib_dict = bibtex_dict.copy()
                 r.file_note = f
-                pdf = os.path.join(
-                    os.path.dirname(f), os.path.basename(f)[:-3] + ".pdf"
-                )
-                if os.path.isfile(pdf):
-                    r.file_doc = pdf
-                r.load_note()
-                self.append(new_object=r)
+                pdf = os.path.basename(f)[:-3] + ".pdf"
+                if pdf in set_pdfs:
+                    r.file_doc = os.path.join(lib_folder, pdf)
+                r.load_note(scan=scan)
+                lst_refs.append(r)
+            self.extend(objects=lst_refs, copy_objects=False)
+            if note_cache is not None:
+                note_cache.save()
@@ -46,15 +46,98 @@ eu eros euismod sodales. Cras pulvinar tincidunt enim nec semper.
 
 """
 
+import bisect
 import copy
 import datetime
 import glob
+import io
 import os
 import re
 import shutil
-import matplotlib.pyplot as plt
 import pandas as pd
-import PyPDF2
+
+
+def run_batch(func, items, workers=None, verbose=True):
+    """Run a function for each item (e.g., note files) and collect the results.
+
+    Items are independent: a failing item is recorded and the run goes on.
+    With more than one worker, items are fanned out to a pool of processes
+    (``func`` must be a module-level function).
+
+    :param func: function called as ``func(item)``. Its return value is
+        counted in the summary (e.g., ``"updated"`` or ``"unchanged"``)
+    :type func: callable
+    :param items: items to process
+    :type items: list
+    :param workers: number of worker processes, up to the number of CPUs
+        (default: one item at a time in this process)
+    :type workers: int
+    :param verbose: option for printing a summary line (and the failed items)
+    :type verbose: bool
+    :return: dictionary with ``count``, ``seconds``, ``counts`` (number of
+        items by returned value, plus ``failed``) and ``results`` (one
+        dictionary per item with ``item``, ``ok``, ``result``, ``error``
+        and ``seconds``, in the order of ``items``)
+    :rtype: dict
+    """
+    import functools
+    import time
+
+    t0 = time.perf_counter()
+    run_item = functools.partial(_run_batch_item, func)
+    # more processes than CPUs only adds overhead
+    workers = min(workers or 1, len(items), os.cpu_count() or 1)
+    if workers <= 1:
+        workers = 1
+        lst_results = [run_item(item) for item in items]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        # a few chunks per worker to keep them busy with little overhead
+        chunksize = max(1, len(items) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            lst_results = list(executor.map(run_item, items, chunksize=chunksize))
+    seconds = time.perf_counter() - t0
+
+    dct_counts = dict()
+    for dct_result in lst_results:
+        key = str(dct_result["result"]) if dct_result["ok"] else "failed"
+        dct_counts[key] = dct_counts.get(key, 0) + 1
+    dct_report = {
+        "count": len(items),
+        "seconds": seconds,
+        "counts": dct_counts,
+        "results": lst_results,
+    }
+    if verbose:
+        str_counts = ", ".join(f"{k} {v}" for k, v in sorted(dct_counts.items()))
+        print(
+            f"--- {len(items)} items in {seconds:.2f} s "
+            f"(workers: {workers}): {str_counts}"
+        )
+        for dct_result in lst_results:
+            if not dct_result["ok"]:
+                print(f"--- failed: {dct_result['item']}: {dct_result['error']}")
+    return dct_report
+
+
+def _run_batch_item(func, item):
+    """Run ``func(item)``, catching errors and timing it (see :func:`run_batch`)"""
+    import time
+
+    t0 = time.perf_counter()
+    try:
+        result = func(item)
+        ok, error = True, None
+    except Exception as e:
+        result, ok, error = None, False, f"{type(e).__name__}: {e}"
+    return {
+        "item": item,
+        "ok": ok,
+        "result": result,
+        "error": error,
+        "seconds": time.perf_counter() - t0,
+    }
 
 
 class MbaE:
@@ -119,6 +202,26 @@ class MbaE:
 
     """
 
+    # Attribute fields
+    name_field = "Name"
+    alias_field = "Alias"
+
+    # Metadata fields
+    mdata_attr_field = "Attribute"
+    mdata_val_field = "Value"
+
+    # Instance data. Downstream objects that do not declare ``__slots__``
+    # get a regular ``__dict__`` on top of these.
+    __slots__ = (
+        "object_name",
+        "object_alias",
+        "name",
+        "alias",
+        "bootfile",
+        "folder_bootfile",
+        "__weakref__",
+    )
+
     def __init__(self, name="MyMbaE", alias=None):
         """
         Initialize the ``MbaE`` object.
@@ -175,16 +278,13 @@ class MbaE:
             self.alias = self.name[:]
 
     def _set_fields(self):
-        """Set fields names"""
-
-        # Attribute fields
-        self.name_field = "Name"
-        self.alias_field = "Alias"
+        """Set instance-level fields names.
 
-        # Metadata fields
-        self.mdata_attr_field = "Attribute"
-        self.mdata_val_field = "Value"
+        Fields names are class-level constants (``*_field`` attributes),
+        shared by all instances.
+        """
         # ... continues in downstream objects ... #
+        return None
 
     def get_metadata(self):
         """Get a dictionary with object metadata.
@@ -256,13 +356,13 @@ class MbaE:
         # read info table from ``csv`` file. metadata keys are the expected fields
         df_info_table = pd.read_csv(bootfile, sep=";", usecols=list_columns)
 
-        # setter loop
-        dict_setter = {}
-        for i in range(len(df_info_table)):
-            # build setter from row
-            dict_setter[df_info_table[self.mdata_attr_field].values[i]] = df_info_table[
-                self.mdata_val_field
-            ].values[i]
+        # build setter from the attribute and value columns
+        dict_setter = dict(
+            zip(
+                df_info_table[self.mdata_attr_field].values,
+                df_info_table[self.mdata_val_field].values,
+            )
+        )
 
         # pass setter to set() method
         self.set(dict_setter=dict_setter)
@@ -277,7 +377,7 @@ class Collection(MbaE):
 
     **Main Attributes:**
 
-    - ``catalog`` (:class:`pandas.DataFrame`): A catalog containing metadata of the objects in the test_collection.
+    - ``catalog`` (:class:`pandas.DataFrame`): A catalog containing metadata of the objects in the test_collection (rebuilt on access after appends and removals).
     - ``collection`` (dict): A dictionary containing the objects in the ``Collection``.
     - name (str): The name of the ``Collection``.
     - alias (str): The name of the ``Collection``.
@@ -286,8 +386,14 @@ class Collection(MbaE):
     **Main Methods:**
 
     - __init__(self, base_object, name="myCatalog"): Initializes a new ``Collection`` with a base object.
-    - update(self, details=False): Updates the ``Collection`` catalog.
+    - update(self, details=False, dirty_only=False): Updates the ``Collection`` catalog.
+    - mark_dirty(self, name): Marks an object as changed for a partial update.
     - append(self, new_object): Appends a new object to the ``Collection``.
+    - extend(self, objects): Appends many objects to the ``Collection`` at once.
+    - from_records(self, records): Appends new base objects set from records.
+    - boot_many(self, table): Boots many base objects from one metadata table.
+    - create_index(self, field, kind="hash"): Indexes a catalog field for lookups.
+    - find(self, **criteria): Finds objects by catalog fields.
     - remove(self, name): Removes an object from the ``Collection``.
 
     **Examples:**
@@ -365,7 +471,13 @@ class Collection(MbaE):
 
     """
 
-    def __init__(self, base_object, name="MyCollection", alias="Col0"):
+    # Attribute fields
+    size_field = "Size"
+    baseobject_field = "Base_Object"  # self.baseobject().__name__
+
+    def __init__(
+        self, base_object, name="MyCollection", alias="Col0", copy_objects=True
+    ):
         """Initialize the ``Collection`` object.
 
         :param base_object: ``MbaE``-based object for collection
@@ -378,6 +490,11 @@ class Collection(MbaE):
             If None, it takes the first and last characters from name
         :type alias: str
 
+        :param copy_objects: option to store deep copies of appended objects.
+            If False (reference mode), the objects themselves are stored and the
+            ``Collection`` takes ownership of them. Default is True.
+        :type copy_objects: bool
+
         """
         # ------------ call super ----------- #
         super().__init__(name=name, alias=alias)
@@ -390,15 +507,25 @@ class Collection(MbaE):
         # Initialize the catalog with an empty DataFrame
         dict_metadata = self.baseobject().get_metadata()
 
+        # the catalog is materialized on access from pending rows and removed names
+        self._pending_rows = []
+        # positions of the pending rows by name (dropped rows become None)
+        self._pending_positions = dict()
+        self._removed_names = set()
+        self._is_stale = False
+        # secondary indexes of catalog fields (see create_index)
+        self._indexes = dict()
+        # names of objects changed since the last update (see mark_dirty)
+        self._dirty_names = set()
         self.catalog = pd.DataFrame(columns=dict_metadata.keys())
 
         # Initialize the ``Collection`` as an empty dictionary
         self.collection = dict()
+        self.copy_objects = copy_objects
 
         # ------------ set mutables ----------- #
         self.size = 0
 
-        self._set_fields()
         # ... continues in downstream objects ... #
 
     def __str__(self):
@@ -414,19 +541,80 @@ class Collection(MbaE):
         )
         return str_out
 
-    def _set_fields(self):
+    @property
+    def catalog(self):
+        """The catalog :class:`pandas.DataFrame` of the ``Collection``.
+
+        Appends and removals are buffered; the catalog is rebuilt
+        (deduplicated and sorted by the unique name) only when accessed.
         """
-        Set fields names.
-        Expected to increment superior methods.
+        if self._is_stale or self._pending_rows or self._removed_names:
+            self._materialize()
+        return self._catalog
+
+    @catalog.setter
+    def catalog(self, df_catalog):
+        self._catalog = df_catalog
+        self._pending_rows = []
+        self._pending_positions = dict()
+        self._removed_names = set()
+        self._is_stale = True
+        # rebuild indexes from the new catalog on the next lookup
+        self._indexes_stale = True
+
+    def _materialize(self):
+        """Apply the pending rows and removed names to the catalog.
+
+        :return: None
+        :rtype: None
         """
-        # ------------ call super ----------- #
-        super()._set_fields()
+        df_catalog = self._catalog
+        # --- the first row is expected to be the Unique name
+        str_unique_name = df_catalog.columns[0]
+        if self._removed_names:
+            df_catalog = df_catalog[
+                ~df_catalog[str_unique_name].isin(self._removed_names)
+            ]
+        lst_rows = [dct_meta for dct_meta in self._pending_rows if dct_meta is not None]
+        if lst_rows:
+            df_aux = Collection._meta_to_df(lst_rows)
+            # Check if the catalog is empty before concatenation
+            if df_catalog.empty:
+                df_catalog = df_aux
+            else:
+                df_catalog = pd.concat([df_catalog, df_aux], ignore_index=True)
+            str_unique_name = df_catalog.columns[0]
+        df_catalog = df_catalog.drop_duplicates(subset=str_unique_name, keep="last")
+        self._catalog = df_catalog.sort_values(by=str_unique_name).reset_index(
+            drop=True
+        )
+        self._pending_rows = []
+        self._pending_positions = dict()
+        self._removed_names = set()
+        self._is_stale = False
+        return None
 
-        # Attribute fields
-        self.size_field = "Size"
-        self.baseobject_field = "Base_Object"  # self.baseobject().__name__
+    @staticmethod
+    def _meta_to_df(lst_meta):
+        """Get a :class:`pandas.DataFrame` from a list of metadata dictionaries.
 
-        # ... continues in downstream objects ... #
+        :param lst_meta: metadata dictionaries (one per row)
+        :type lst_meta: list
+        :return: catalog rows
+        :rtype: :class:`pandas.DataFrame`
+        """
+        dct_meta_df = dict()
+        for dct_meta in lst_meta:
+            for k in dct_meta:
+                dct_meta_df[k] = None
+        for k in dct_meta_df:
+            values = [dct_meta.get(k) for dct_meta in lst_meta]
+            # columns of mixed types or None are objects (as single-row concats)
+            set_types = set(type(v) for v in values)
+            if len(set_types) > 1 or type(None) in set_types:
+                values = pd.Series(values, dtype=object)
+            dct_meta_df[k] = values
+        return pd.DataFrame(dct_meta_df)
 
     def get_metadata(self):
         """Get a dictionary with object metadata.
@@ -452,63 +640,128 @@ class Collection(MbaE):
         dict_meta.update(dict_meta_local)
         return dict_meta
 
-    def update(self, details=False):
+    def update(self, details=False, dirty_only=False):
         """Update the ``Collection`` catalog.
 
         :param details: Option to update catalog details, defaults to False.
         :type details: bool
+        :param dirty_only: Option to update details only for the objects
+            marked with :meth:`mark_dirty` since the last update, defaults to False.
+        :type dirty_only: bool
         :return: None
         :rtype: None
         """
 
         # Update details if specified
-        if details:
-            # Create a new empty catalog
-            df_new_catalog = pd.DataFrame(columns=self.catalog.columns)
-
-            # retrieve details from collection
-            for name in self.collection:
-                # retrieve updated metadata from base object
-                dct_meta = self.collection[name].get_metadata()
-
-                # set up a single-row helper dataframe
-                lst_keys = dct_meta.keys()
-                _dct = dict()
-                for k in lst_keys:
-                    _dct[k] = [dct_meta[k]]
-
-                # Set new information
-                df_aux = pd.DataFrame(_dct)
-
-                # Append to the new catalog
-                df_new_catalog = pd.concat([df_new_catalog, df_aux], ignore_index=True)
-
-            # consider if the name itself has changed in the
-            old_key_names = list(self.collection.keys())[:]
-            new_key_names = list(df_new_catalog[self.catalog.columns[0]].values)
-
-            # loop for checking consistency in collection keys
-            for i in range(len(old_key_names)):
-                old_key = old_key_names[i]
-                new_key = new_key_names[i]
-                # name change condition
-                if old_key != new_key:
-                    # rename key in the collection dictionary
-                    self.collection[new_key] = self.collection.pop(old_key)
-
-            # Update the catalog with the new details
-            self.catalog = df_new_catalog.copy()
-            # clear
-            del df_new_catalog
+        if details and dirty_only:
+            self._update_dirty()
+        elif details:
+            # the first column is expected to be the Unique name
+            lst_columns = list(self.catalog.columns)
+            str_unique_name = lst_columns[0]
+
+            # retrieve updated metadata from all objects at once
+            old_key_names = list(self.collection.keys())
+            lst_objects = list(self.collection.values())
+            lst_meta = [o.get_metadata() for o in lst_objects]
+            new_key_names = [dct_meta[str_unique_name] for dct_meta in lst_meta]
+
+            # consider if the name itself has changed (single pass)
+            if old_key_names != new_key_names:
+                dct_collection = dict()
+                lst_renamed = []
+                for old_key, new_key, o in zip(
+                    old_key_names, new_key_names, lst_objects
+                ):
+                    if old_key == new_key:
+                        dct_collection[old_key] = o
+                    else:
+                        lst_renamed.append((new_key, o))
+                # renamed keys go last
+                for new_key, o in lst_renamed:
+                    dct_collection[new_key] = o
+                self.collection = dct_collection
+
+            # Build the new catalog at once
+            set_columns = set(lst_columns)
+            for dct_meta in lst_meta:
+                for k in dct_meta:
+                    if k not in set_columns:
+                        set_columns.add(k)
+                        lst_columns.append(k)
+            dct_catalog = dict()
+            for k in lst_columns:
+                dct_catalog[k] = [dct_meta.get(k) for dct_meta in lst_meta]
+            self.catalog = pd.DataFrame(dct_catalog, columns=lst_columns, dtype=object)
+            self._dirty_names = set()
 
         # Basic updates
-        # --- the first row is expected to be the Unique name
-        str_unique_name = self.catalog.columns[0]
-        self.catalog = self.catalog.drop_duplicates(subset=str_unique_name, keep="last")
-        self.catalog = self.catalog.sort_values(by=str_unique_name).reset_index(
-            drop=True
-        )
-        self.size = len(self.catalog)
+        # --- deduplication and sorting are deferred to the next catalog access
+        self._is_stale = True
+        self.size = len(self.collection)
+        return None
+
+    def mark_dirty(self, name):
+        """Mark an object as changed, for ``update(details=True, dirty_only=True)``.
+
+        :param name: key of the object in the ``collection`` (its name before any change)
+        :type name: str
+        :return: None
+        :rtype: None
+        """
+        self._dirty_names.add(name)
+        return None
+
+    def _update_dirty(self):
+        """Refresh the catalog details of the objects marked as dirty.
+
+        :return: None
+        :rtype: None
+        """
+        lst_meta = []
+        for name in sorted(self._dirty_names):
+            if name not in self.collection:
+                continue
+            o = self.collection[name]
+            dct_meta = o.get_metadata()
+            new_name = dct_meta[self.name_field]
+            if new_name != name:
+                # rename key in the collection dictionary
+                self.collection[new_name] = self.collection.pop(name)
+                self._drop_row(name=name)
+            lst_meta.append(dct_meta)
+        self._buffer_rows(lst_meta=lst_meta)
+        self._index_rows(lst_meta=lst_meta)
+        self._dirty_names = set()
+        return None
+
+    def _drop_row(self, name):
+        """Drop the catalog row and the index entries of a name.
+
+        :param name: unique name
+        :type name: str
+        :return: None
+        :rtype: None
+        """
+        self._removed_names.add(name)
+        for i in self._pending_positions.pop(name, []):
+            self._pending_rows[i] = None
+        for index in self._indexes.values():
+            Collection._index_drop(index=index, name=name)
+        return None
+
+    def _buffer_rows(self, lst_meta):
+        """Buffer metadata rows for the catalog (see :meth:`_materialize`).
+
+        :param lst_meta: metadata dictionaries (one per object)
+        :type lst_meta: list
+        :return: None
+        :rtype: None
+        """
+        n_rows = len(self._pending_rows)
+        self._pending_rows.extend(lst_meta)
+        for i, dct_meta in enumerate(lst_meta, n_rows):
+            self._pending_positions.setdefault(dct_meta[self.name_field], []).append(i)
         return None
 
     # review ok
@@ -524,28 +777,346 @@ class Collection(MbaE):
         :return: None
         :rtype: None
         """
-        # Append a copy of the object to the ``Collection``
-        copied_object = copy.deepcopy(new_object)
-        self.collection[new_object.name] = copied_object
+        # Append a copy of the object (or the object itself) to the ``Collection``
+        if self.copy_objects:
+            new_object = copy.deepcopy(new_object)
+        self.collection[new_object.name] = new_object
 
-        # Update the catalog with the new object's metadata
+        # Buffer the new object's metadata for the catalog
         dct_meta = new_object.get_metadata()
-        dct_meta_df = dict()
-        for k in dct_meta:
-            dct_meta_df[k] = [dct_meta[k]]
-        df_aux = pd.DataFrame(dct_meta_df)
-
-        # Check if self.catalog is empty before concatenation
-        if self.catalog.empty:
-            # If it's empty, just assign df_aux to self.catalog
-            self.catalog = df_aux
-        else:
-            # If it's not empty, perform the concatenation
-            self.catalog = pd.concat([self.catalog, df_aux], ignore_index=True)
+        self._buffer_rows(lst_meta=[dct_meta])
+        self._index_rows(lst_meta=[dct_meta])
 
         self.update()
         return None
 
+    def extend(self, objects, copy_objects=None):
+        """Append many objects to the ``Collection`` at once.
+
+        Same outcome as calling :meth:`append` for each object, but the catalog
+        is built in one ``DataFrame`` construction and sorted and deduplicated once.
+
+        :param objects: Objects to append.
+        :type objects: iterable
+
+        :param copy_objects: option to store deep copies of the objects.
+            If None, it takes the ``copy_objects`` attribute of the ``Collection``.
+            Pass False for objects nobody else holds (e.g., freshly created by a loader).
+        :type copy_objects: bool or None
+
+        :return: None
+        :rtype: None
+        """
+        if copy_objects is None:
+            copy_objects = self.copy_objects
+        lst_meta = []
+        for new_object in objects:
+            # Append a copy of the object (or the object itself) to the ``Collection``
+            lst_meta.append(new_object.get_metadata())
+            if copy_objects:
+                new_object = copy.deepcopy(new_object)
+            self.collection[new_object.name] = new_object
+        if len(lst_meta) == 0:
+            return None
+
+        # Buffer the metadata of all objects for the catalog
+        self._buffer_rows(lst_meta=lst_meta)
+        self._index_rows(lst_meta=lst_meta)
+
+        self.update()
+        return None
+
+    def from_records(self, records, bootfile=None, load_data=None, base_kwargs=None):
+        """Append new base objects set from records.
+
+        Each record is a setter dictionary passed to the ``set()`` method of a
+        new instance of the base object.
+
+        :param records: Setter dictionaries or a :class:`pandas.DataFrame` (one record per row).
+        :type records: list or :class:`pandas.DataFrame`
+        :param bootfile: [optional] file path of the records table, set as the ``bootfile`` of
+            every new object (relative file paths are resolved from its folder)
+        :type bootfile: str
+        :param load_data: [optional] passed to ``set()`` for base objects that load data
+            (e.g., ``DataSet``). If None, ``set()`` runs with its default
+        :type load_data: bool
+        :param base_kwargs: [optional] keyword arguments for the base object constructor
+            (e.g., ``{"folder_base": "./"}`` for ``FileSys``)
+        :type base_kwargs: dict
+
+        :return: None
+        :rtype: None
+        """
+        if isinstance(records, pd.DataFrame):
+            records = records.to_dict(orient="records")
+        if base_kwargs is None:
+            base_kwargs = dict()
+        dct_set_kwargs = dict()
+        if load_data is not None:
+            dct_set_kwargs["load_data"] = load_data
+        lst_objects = []
+        for record in records:
+            new_object = self.baseobject(**base_kwargs)
+            if bootfile is not None:
+                new_object.bootfile = bootfile
+                new_object.folder_bootfile = os.path.dirname(bootfile)
+            new_object.set(dict_setter=record, **dct_set_kwargs)
+            lst_objects.append(new_object)
+        # the new objects are not held elsewhere: no copies needed
+        self.extend(objects=lst_objects, copy_objects=False)
+        return None
+
+    def boot_many(self, table, sep=";", load_data=None, base_kwargs=None):
+        """Boot many base objects from one metadata table.
+
+        Unlike :meth:`MbaE.boot`, which reads one ``Attribute;Value`` table
+        per object, the table here is wide: one column per field and one row
+        per object. It is read once and each row is passed to ``set()``.
+
+        .. code-block:: text
+
+            Name;Alias;Color;Source;Description;File_Data
+            Rain;Rn;blue;INMET;Daily rain;./rain.csv
+            Flow;Fw;navy;ANA;Daily flow;./flow.csv
+
+        :param table: file path to the ``csv`` table, or the table itself
+        :type table: str or :class:`pandas.DataFrame`
+        :param sep: column separator of the ``csv`` file. Default is ``;``
+        :type sep: str
+        :param load_data: [optional] passed to ``set()`` (see :meth:`from_records`)
+        :type load_data: bool
+        :param base_kwargs: [optional] keyword arguments for the base object constructor
+        :type base_kwargs: dict
+        :return: None
+        :rtype: None
+        """
+        bootfile = None
+        if isinstance(table, pd.DataFrame):
+            df_table = table
+        else:
+            bootfile = os.path.abspath(table)
+            df_table = pd.read_csv(bootfile, sep=sep)
+        self.from_records(
+            records=df_table,
+            bootfile=bootfile,
+            load_data=load_data,
+            base_kwargs=base_kwargs,
+        )
+        return None
+
+    def create_index(self, field, kind="hash"):
+        """Create (or rebuild) an index of a catalog field for :meth:`find`.
+
+        Indexes are kept consistent across :meth:`append`, :meth:`extend`,
+        :meth:`remove` and ``update(details=True)``.
+
+        :param field: catalog field (column) name, e.g., ``"year"``
+        :type field: str
+        :param kind: ``"hash"`` for equality lookups or ``"sorted"`` for
+            equality and range lookups (values must be comparable). Default is ``"hash"``
+        :type kind: str
+        :return: None
+        :rtype: None
+        """
+        if kind not in ["hash", "sorted"]:
+            raise ValueError(f"Index kind must be 'hash' or 'sorted', not '{kind}'")
+        self._indexes[field] = self._build_index(field=field, kind=kind)
+        if self._indexes_stale:
+            # the flag is shared: rebuild the other indexes too before clearing it
+            for index in list(self._indexes.values()):
+                if index["field"] != field:
+                    self._indexes[index["field"]] = self._build_index(
+                        field=index["field"], kind=index["kind"]
+                    )
+            self._indexes_stale = False
+        return None
+
+    def _build_index(self, field, kind):
+        """Build the index of a catalog field from the catalog.
+
+        :param field: catalog field (column) name
+        :type field: str
+        :param kind: ``"hash"`` or ``"sorted"`` (see :meth:`create_index`)
+        :type kind: str
+        :return: index dictionary
+        :rtype: dict
+        """
+        df_catalog = self.catalog
+        if field not in df_catalog.columns:
+            raise KeyError(f"Field '{field}' not in the catalog")
+        str_unique_name = df_catalog.columns[0]
+        index = {
+            "field": field,
+            "kind": kind,
+            "values": dict(),  # name: value
+            "hash": dict(),  # value: set of names
+            "keys": [],  # sorted values
+            "names": [],  # names in the order of keys
+        }
+        ls_names = df_catalog[str_unique_name].tolist()
+        ls_values = [Collection._index_value(v) for v in df_catalog[field].tolist()]
+        for name, value in zip(ls_names, ls_values):
+            index["values"][name] = value
+            index["hash"].setdefault(value, set()).add(name)
+        if kind == "sorted":
+            ls_pairs = sorted(
+                (v, n) for n, v in zip(ls_names, ls_values) if v is not None
+            )
+            index["keys"] = [p[0] for p in ls_pairs]
+            index["names"] = [p[1] for p in ls_pairs]
+        return index
+
+    def drop_index(self, field):
+        """Drop the index of a catalog field.
+
+        :param field: catalog field (column) name
+        :type field: str
+        :return: None
+        :rtype: None
+        """
+        del self._indexes[field]
+        return None
+
+    def find(self, **criteria):
+        """Find objects by catalog fields, using the indexes when available.
+
+        Each criterion is a field and either a value (equality), a ``tuple``
+        ``(low, high)`` (inclusive range, ``None`` for an open end) or a
+        ``list`` or ``set`` of values (any of them). Fields without an index
+        are filtered on the catalog.
+
+        **Examples:**
+
+        .. code-block:: python
+
+            c.create_index("year", kind="sorted")
+            c.find(entry_type="article", year=("2010", "2019"))
+
+        :return: objects matching all criteria, sorted by name
+        :rtype: list
+        """
+        if self._indexes_stale:
+            for index in list(self._indexes.values()):
+                self._indexes[index["field"]] = self._build_index(
+                    field=index["field"], kind=index["kind"]
+                )
+            self._indexes_stale = False
+        set_names = None
+        for field in criteria:
+            if field in self._indexes:
+                set_found = Collection._index_find(
+                    index=self._indexes[field], criterion=criteria[field]
+                )
+            else:
+                set_found = self._catalog_find(field=field, criterion=criteria[field])
+            set_names = set_found if set_names is None else set_names & set_found
+            if len(set_names) == 0:
+                break
+        if set_names is None:
+            set_names = set(self.collection)
+        return [self.collection[name] for name in sorted(set_names)]
+
+    def _index_rows(self, lst_meta):
+        """Put metadata rows in the indexes.
+
+        :param lst_meta: metadata dictionaries (one per object)
+        :type lst_meta: list
+        :return: None
+        :rtype: None
+        """
+        for index in self._indexes.values():
+            for dct_meta in lst_meta:
+                Collection._index_put(
+                    index=index,
+                    name=dct_meta[self.name_field],
+                    value=dct_meta.get(index["field"]),
+                )
+        return None
+
+    def _catalog_find(self, field, criterion):
+        """Get the names matching a criterion by filtering the catalog.
+
+        :return: names
+        :rtype: set
+        """
+        df_catalog = self.catalog
+        if field not in df_catalog.columns:
+            raise KeyError(f"Field '{field}' not in the catalog")
+        series = df_catalog[field]
+        if isinstance(criterion, tuple):
+            mask = series.notna()
+            if criterion[0] is not None:
+                mask = mask & (series >= criterion[0])
+            if criterion[1] is not None:
+                mask = mask & (series <= criterion[1])
+        elif isinstance(criterion, (list, set)):
+            mask = series.isin(criterion)
+        elif criterion is None:
+            mask = series.isna()
+        else:
+            mask = series == criterion
+        return set(df_catalog[df_catalog.columns[0]][mask].tolist())
+
+    @staticmethod
+    def _index_value(value):
+        # missing values (None or NaN) are indexed as None
+        if value is None or (isinstance(value, float) and value != value):
+            return None
+        return value
+
+    @staticmethod
+    def _index_put(index, name, value):
+        value = Collection._index_value(value)
+        if name in index["values"]:
+            Collection._index_drop(index=index, name=name)
+        index["values"][name] = value
+        index["hash"].setdefault(value, set()).add(name)
+        if index["kind"] == "sorted" and value is not None:
+            i = bisect.bisect_right(index["keys"], value)
+            index["keys"].insert(i, value)
+            index["names"].insert(i, name)
+
+    @staticmethod
+    def _index_drop(index, name):
+        if name not in index["values"]:
+            return None
+        value = index["values"].pop(name)
+        set_names = index["hash"][value]
+        set_names.discard(name)
+        if len(set_names) == 0:
+            del index["hash"][value]
+        if index["kind"] == "sorted" and value is not None:
+            i = bisect.bisect_left(index["keys"], value)
+            while index["names"][i] != name:
+                i = i + 1
+            del index["keys"][i]
+            del index["names"][i]
+
+    @staticmethod
+    def _index_find(index, criterion):
+        if isinstance(criterion, tuple):
+            low, high = criterion
+            if index["kind"] == "sorted":
+                i0 = 0 if low is None else bisect.bisect_left(index["keys"], low)
+                i1 = len(index["keys"])
+                if high is not None:
+                    i1 = bisect.bisect_right(index["keys"], high)
+                return set(index["names"][i0:i1])
+            # ranges on a hash index scan its distinct values
+            set_found = set()
+            for value in index["hash"]:
+                if value is None:
+                    continue
+                if (low is None or value >= low) and (high is None or value <= high):
+                    set_found.update(index["hash"][value])
+            return set_found
+        if isinstance(criterion, (list, set)):
+            set_found = set()
+            for value in criterion:
+                set_found.update(index["hash"].get(value, set()))
+            return set_found
+        return set(index["hash"].get(Collection._index_value(criterion), set()))
+
     def remove(self, name):
         """Remove an object from the ``Collection`` by the name.
 
@@ -557,13 +1128,8 @@ class Collection(MbaE):
         """
         # Delete the object from the ``Collection``
         del self.collection[name]
-        # Delete the object's entry from the catalog
-        str_unique_name = self.catalog.columns[
-            0
-        ]  # assuming the first column is the unique name
-        self.catalog = self.catalog.drop(
-            self.catalog[self.catalog[str_unique_name] == name].index
-        ).reset_index(drop=True)
+        # Mark the object's entry for deletion from the catalog
+        self._drop_row(name=name)
         self.update()
         return None
 
@@ -654,6 +1220,13 @@ class DataSet(MbaE):
 
     """
 
+    # Attribute fields
+    filedata_field = "File_Data"
+    size_field = "Size"
+    color_field = "Color"
+    source_data_field = "Source"
+    descri_data_field = "Description"
+
     def __init__(self, name="MyDataSet", alias="DS0"):
         """Initialize the ``DataSet`` object.
         Expected to increment superior methods.
@@ -709,22 +1282,6 @@ class DataSet(MbaE):
             )
         return str_out
 
-    def _set_fields(self):
-        """Set fields names.
-        Expected to increment superior methods.
-
-        """
-        # ------------ call super ----------- #
-        super()._set_fields()
-        # Attribute fields
-        self.filedata_field = "File_Data"
-        self.size_field = "Size"
-        self.color_field = "Color"
-        self.source_data_field = "Source"
-        self.descri_data_field = "Description"
-
-        # ... continues in downstream objects ... #
-
     def _set_view_specs(self):
         """Set view specifications.
         Expected to overwrite superior methods.
@@ -788,9 +1345,6 @@ class DataSet(MbaE):
         """
         # refresh all mutable attributes
 
-        # set fields
-        self._set_fields()
-
         if self.data is not None:
             # data size (rows)
             self.size = len(self.data)
@@ -916,6 +1470,8 @@ class DataSet(MbaE):
         >>> ds.view(show=False)
 
         """
+        import matplotlib.pyplot as plt
+
         # get specs
         specs = self.view_specs.copy()
 
@@ -967,6 +1523,11 @@ class DataSet(MbaE):
 
 
 class Note(MbaE):
+    # Attribute fields
+    file_note_field = "file_note"
+
+    # Regular expression to match the YAML header
+    yaml_header_regex = r"^---\s*\n(.*?)\n---\s*\n"
 
     def __init__(self, name="MyNote", alias="Nt1"):
         # set attributes
@@ -976,16 +1537,6 @@ class Note(MbaE):
         super().__init__(name=name, alias=alias)
         # ... continues in downstream objects ... #
 
-    def _set_fields(self):
-        """Set fields names"""
-        super()._set_fields()
-        # Attribute fields
-        self.file_note_field = "file_note"
-
-        # Metadata fields
-
-        # ... continues in downstream objects ... #
-
     def get_metadata(self):
         """Get a dictionary with object metadata.
         Expected to increment superior methods.
@@ -1018,20 +1569,40 @@ class Note(MbaE):
     def load_data(self):
         self.data = Note.parse_note(self.file_note)
 
-    def load(self):
+    def load(self, metadata_only=False):
+        """Load the note from its file.
+
+        :param metadata_only: option for loading only the front matter (the header
+            is read and ``data`` is not loaded). Default is False
+        :type metadata_only: bool
+        :return: None
+        :rtype: None
+        """
         self.load_metadata()
-        self.load_data()
+        if not metadata_only:
+            self.load_data()
+        return None
 
     def save(self):
-        self.to_file(file_path=self.file_note)
+        """Save the note to its file (only if the content changed).
+
+        :return: True if the file was written
+        :rtype: bool
+        """
+        return self.to_file(file_path=self.file_note)
 
     def to_file(self, file_path, cleanup=True):
-        """Export Note to markdown
+        """Export Note to markdown.
+
+        The content is built in memory and written at once (through a temporary
+        file) only if it differs from the current content of the file.
 
         :param file_path: path to file
         :type file_path: str
-        :return:
-        :rtype:
+        :param cleanup: option for collapsing consecutive blank lines. Default is True
+        :type cleanup: bool
+        :return: True if the file was written, False if it was already up to date
+        :rtype: bool
         """
         ls_metadata = Note.metadata_to_list(self.metadata)
         # clear "None" values
@@ -1043,18 +1614,52 @@ class Note(MbaE):
         for l in ls_data:
             ls_metadata.append(l[:])
         ls_all = [line + "\n" for line in ls_metadata]
-        with open(file_path, "w", encoding="utf-8") as file:
-            file.writelines(ls_all)
 
         # clean up excessive lines
         if cleanup:
-            Note.remove_excessive_blank_lines(file_path)
+            # split as the lines would be read back from the file
+            ls_all = io.StringIO("".join(ls_all), newline=None).readlines()
+            ls_all = Note.collapse_blank_lines(ls_all)
+
+        return Note.write_if_changed(file_path=file_path, content="".join(ls_all))
 
     @staticmethod
-    def remove_excessive_blank_lines(file_path):
-        with open(file_path, "r", encoding="utf-8") as file:
-            lines = file.readlines()
+    def write_if_changed(file_path, content):
+        """Write text to a file only if it differs from the current content.
 
+        The file is replaced atomically (write to a temporary file and rename),
+        so readers never see a partial file.
+
+        :param file_path: path to file
+        :type file_path: str
+        :param content: full text content (``\\n`` line endings)
+        :type content: str
+        :return: True if the file was written
+        :rtype: bool
+        """
+        data = content.replace("\n", os.linesep).encode("utf-8")
+        try:
+            if os.path.getsize(file_path) == len(data):
+                with open(file_path, "rb") as file:
+                    if file.read() == data:
+                        return False
+        except OSError:
+            pass
+        file_tmp = file_path + ".tmp"
+        with open(file_tmp, "wb") as file:
+            file.write(data)
+        os.replace(file_tmp, file_path)
+        return True
+
+    @staticmethod
+    def collapse_blank_lines(lines):
+        """Collapse consecutive blank lines into one.
+
+        :param lines: list of lines
+        :type lines: list
+        :return: list of lines
+        :rtype: list
+        """
         cleaned_lines = []
         previous_line_blank = False
 
@@ -1066,25 +1671,54 @@ class Note(MbaE):
             else:
                 cleaned_lines.append(line)
                 previous_line_blank = False
+        return cleaned_lines
+
+    @staticmethod
+    def remove_excessive_blank_lines(file_path):
+        with open(file_path, "r", encoding="utf-8") as file:
+            lines = file.readlines()
 
-        with open(file_path, "w", encoding="utf-8") as file:
-            file.writelines(cleaned_lines)
+        Note.write_if_changed(
+            file_path=file_path, content="".join(Note.collapse_blank_lines(lines))
+        )
 
     @staticmethod
     def parse_metadata(note_file):
         """Extracts YAML metadata from the header of a Markdown file.
 
+        The file is read line by line, only up to the closing ``---`` of the header.
+
         :param note_file: str, path to the Markdown file
         :return: dict, extracted YAML metadata
         """
+        lines = []
         with open(note_file, "r", encoding="utf-8") as file:
-            content = file.read()
+            for line in file:
+                lines.append(line)
+                if len(lines) == 1:
+                    if not line.startswith("---"):
+                        # no YAML header
+                        return None
+                elif line.startswith("---"):
+                    # possible end of the header
+                    content = "".join(lines)
+                    match = re.search(Note.yaml_header_regex, content, re.DOTALL)
+                    # only final if the header starts where it would in the
+                    # full content (after all blank lines of the opening)
+                    match_open = re.match(r"---\s*\n", content)
+                    if match and match.start(1) == match_open.end():
+                        return Note.parse_yaml(match.group(1))
+        return Note.parse_metadata_text("".join(lines))
 
-        # Regular expression to match the YAML header
-        yaml_header_regex = r"^---\s*\n(.*?)\n---\s*\n"
+    @staticmethod
+    def parse_metadata_text(content):
+        """Extracts YAML metadata from the header of a Markdown text.
 
+        :param content: str, full content of the Markdown file
+        :return: dict, extracted YAML metadata
+        """
         # Search for the YAML header in the content
-        match = re.search(yaml_header_regex, content, re.DOTALL)
+        match = re.search(Note.yaml_header_regex, content, re.DOTALL)
 
         if match:
             yaml_content = match.group(1)
@@ -1096,50 +1730,74 @@ class Note(MbaE):
     def parse_yaml(yaml_content):
         """Parses YAML content into a dictionary.
 
+        Single pass over the lines of the front matter:
+
+        - ``key: value`` scalars (surrounding double quotes are removed)
+        - ``key:`` followed by `` - item`` lines (block lists)
+        - ``key: [a, "b"]`` (inline lists)
+        - ``tags: - a - b`` (inline tags, hyphenated tags are kept)
+
+        Keys with no value and empty lists are set to None.
+
         :param yaml_content: str, YAML content as string
         :return: dict, parsed YAML content
         """
         metadata = {}
-        lines = yaml_content.split("\n")
         current_key = None
         current_list = None
 
-        for line in lines:
-            if line.strip() == "":
+        for line in yaml_content.split("\n"):
+            stripped = line.strip()
+            if not stripped:
                 continue
-            if ":" in line:
-                key, value = line.split(":", 1)
-                key = key.strip()
-                value = value.strip()
-                if value == "":  # start of a list
-                    current_key = key
-                    current_list = []
+            if current_list is not None and stripped[0] == "-":
+                # block list item
+                if not current_list:
                     metadata[current_key] = current_list
-                else:
-                    if key == "tags":
-                        metadata[key] = [
-                            v.strip() for v in value.split("-") if v.strip()
-                        ]
-                    else:
-                        metadata[key] = value
-            elif current_list is not None and line.strip().startswith("-"):
-                current_list.append(line.strip()[1:].strip())
-
-        # fix empty lists
-        for e in metadata:
-            if len(metadata[e]) == 0:
-                metadata[e] = None
-
-        # fix text fields
-        for e in metadata:
-            if metadata[e]:
-                size = len(metadata[e]) - 1
-                if metadata[e][0] == '"' and metadata[e][size] == '"':
-                    # slice it
-                    metadata[e] = metadata[e][1:size]
+                current_list.append(stripped[1:].lstrip())
+                continue
+            key, sep, value = stripped.partition(":")
+            if not sep:
+                continue
+            key = key.rstrip()
+            value = value.lstrip()
+            if not value:
+                # start of a block list (None while it has no items)
+                current_key = key
+                current_list = []
+                metadata[key] = None
+                continue
+            current_list = None
+            if value[0] == "[" and value[-1] == "]":
+                metadata[key] = Note._parse_yaml_inline_list(value[1:-1])
+            elif key == "tags":
+                # list markers are hyphens between blanks
+                lst_tags = re.split(r"(?:^|\s)-(?:\s|$)", value)
+                metadata[key] = [v.strip() for v in lst_tags if v.strip()] or None
+            elif value[0] == '"' and value[-1] == '"':
+                metadata[key] = value[1:-1]
+            else:
+                metadata[key] = value
 
         return metadata
 
+    @staticmethod
+    def _parse_yaml_inline_list(content):
+        """Split the items of an inline YAML list (the text between brackets).
+
+        :param content: str, text between the brackets
+        :return: list of items (double quotes removed) or None if empty
+        """
+        lst_items = []
+        for item in re.findall(r'\s*("[^"]*"|[^,]*)\s*(?:,|$)', content):
+            item = item.strip()
+            if len(item) >= 2 and item[0] == '"' and item[-1] == '"':
+                item = item[1:-1]
+            elif item == "":
+                continue
+            lst_items.append(item)
+        return lst_items or None
+
     @staticmethod
     def metadata_to_list(metadata_dict):
         ls_metadata = []
@@ -1176,7 +1834,15 @@ class Note(MbaE):
     def parse_note(file_path):
         with open(file_path, "r", encoding="utf-8") as file:
             lines = file.readlines()
+        return Note.parse_note_lines(lines)
+
+    @staticmethod
+    def parse_note_lines(lines):
+        """Split the lines of a Markdown file in Head, Body and Tail.
 
+        :param lines: list, lines of the file (with line endings)
+        :return: dict, ``Head``, ``Body`` and ``Tail`` lists of stripped lines
+        """
         # Skip YAML header if present
         if lines[0].strip() == "---":
             yaml_end_index = lines.index("---\n", 1) + 1
@@ -1384,6 +2050,12 @@ class RecordTable(DataSet):
 
     """
 
+    # base columns fields
+    recid_field = "RecId"
+    rectable_field = "RecTable"
+    rectimest_field = "RecTimestamp"
+    recstatus_field = "RecStatus"
+
     def __init__(self, name="MyRecordTable", alias="RcT"):
         # prior attributes
 
@@ -1403,20 +2075,6 @@ class RecordTable(DataSet):
         # UPDATE
         self.update()
 
-    def _set_fields(self):
-        """Set fields names.
-        Expected to increment superior methods.
-
-        """
-        # ------------ call super ----------- #
-        super()._set_fields()
-        # base columns fields
-        self.recid_field = "RecId"
-        self.rectable_field = "RecTable"
-        self.rectimest_field = "RecTimestamp"
-        self.recstatus_field = "RecStatus"
-        # ... continues in downstream objects ... #
-
     def _set_base_columns(self):
         """Set base columns names.
         Base Method. Expected to be incremented in superior methods.
@@ -1971,6 +2629,9 @@ class RecordTable(DataSet):
 
 
 class Budget(RecordTable):
+    # set temporary util fields
+    sign_field = "Sign"
+    value_signed = "Value_Signed"
 
     def __init__(self, name="MyBudget", alias="Bud"):
         super().__init__(name=name, alias=alias)
@@ -1981,18 +2642,6 @@ class Budget(RecordTable):
         self.total_net = None
         self.summary_ascend = False
 
-    def _set_fields(self):
-        """Set fields names.
-        Expected to increment superior methods.
-
-        """
-        # ------------ call super ----------- #
-        super()._set_fields()
-        # set temporary util fields
-        self.sign_field = "Sign"
-        self.value_signed = "Value_Signed"
-        # ... continues in downstream objects ... #
-
     def _set_data_columns(self):
         """Set specifics data columns names.
         Base Dummy Method. Expected to be incremented in superior methods.
@@ -2202,6 +2851,9 @@ class FileSys(DataSet):
 
     """
 
+    # Attribute fields
+    folder_base_field = "Folder_Base"
+
     def __init__(self, folder_base, name="MyFS", alias="FS0"):
         """Initialize the ``FileSys`` object.
         Expected to increment superior methods.
@@ -2232,19 +2884,6 @@ class FileSys(DataSet):
 
         # ... continues in downstream objects ... #
 
-    def _set_fields(self):
-        """
-        Set fields names. Expected to increment superior methods.
-
-        """
-        # ------------ call super ----------- #
-        super()._set_fields()
-
-        # Attribute fields
-        self.folder_base_field = "Folder_Base"
-
-        # ... continues in downstream objects ... #
-
     def _set_view_specs(self):
         """Set view specifications.
         Expected to overwrite superior methods.
@@ -2485,6 +3124,7 @@ class FileSys(DataSet):
         >>> ds.view(show=False)
 
         """
+        import matplotlib.pyplot as plt
 
         # get specs
         specs = self.view_specs.copy()
@@ -2544,6 +3184,8 @@ class FileSys(DataSet):
         :return: path to output file
         :rtype: str
         """
+        import PyPDF2
+
         if len(lst_pdfs) == 0:
             return None
         else:
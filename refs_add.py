@@ -1,28 +1,36 @@
 import argparse
 import os
+import threading
+import time
 
 from losalamos.refs import Ref
 
 
 def get_subdirs(src_folder):
     # get list of valid subdirs in src folder
-    lst_dirs = [
-        d
-        for d in os.listdir(src_folder)
-        if os.path.isdir(os.path.join(src_folder, d)) and not d.startswith("_")
-    ]
+    with os.scandir(src_folder) as entries:
+        lst_dirs = [
+            e.name
+            for e in entries
+            if e.is_dir(follow_symlinks=False) and not e.name.startswith(("_", "."))
+        ]
     return lst_dirs
 
 
-def add(src_folder, lib_folder, template_folder, tags):
-    lst_files = Ref.catalog_files(src_folder)
-    if len(lst_files) == 0:
+def get_tag(subdir):
+    return subdir.replace(" ", "-").lower()
+
+
+def add(
+    src_folder, lib_folder, template_folder, tags, workers=None, pairs=None, errors=None
+):
+    if pairs is None:
+        pairs = Ref.catalog_files(src_folder)
+    if len(pairs) == 0:
         print("--- no refs found\n")
         pass
     else:
-        print(
-            "--- batching {} new refs from {} ...\n".format(len(lst_files), src_folder)
-        )
+        print("--- batching {} new refs from {} ...\n".format(len(pairs), src_folder))
         # Add batch
         Ref.add_bat(
             src_folder=src_folder,
@@ -31,29 +39,226 @@ def add(src_folder, lib_folder, template_folder, tags):
             tags=tags,
             related=None,
             clean=True,
+            workers=workers,
+            pairs=pairs,
+            errors=errors,
         )
         print("\n--- OK")
     return None
 
 
-def main(src_folder, lib_folder, template_folder):
+def main(src_folder, lib_folder, template_folder, workers=None):
     print(f"\n--- Adding refs from: {src_folder}")
     print(f"--- Library folder: {lib_folder}")
 
     # get list of valid subdirs in src folder
     lst_dirs = get_subdirs(src_folder=src_folder)
 
-    # run for each subdir the add function
+    # run for each subdir (and its own subdirs) the add function
     for d in lst_dirs:
-        tag = d.replace(" ", "-").lower()
+        tag = get_tag(d)
         lst_tags = [tag]
         print(f"\n--- subfolder: {d} -- tag: {tag}")
-        add(
-            src_folder=f"{src_folder}/{d}",
-            lib_folder=lib_folder,
-            template_folder=template_folder,
-            tags=lst_tags,
+        sub_folder = f"{src_folder}/{d}"
+        n_pairs = 0
+        for rel_dir, pairs, orphans in Ref.iter_catalog(sub_folder):
+            for f in orphans:
+                print(f"--- orphan file (no matching bib/pdf): {d}/{f}")
+            if pairs:
+                n_pairs = n_pairs + len(pairs)
+                add(
+                    src_folder=sub_folder,
+                    lib_folder=lib_folder,
+                    template_folder=template_folder,
+                    tags=lst_tags,
+                    workers=workers,
+                    pairs=pairs,
+                )
+        if n_pairs == 0:
+            print("--- no refs found\n")
+    return None
+
+
+def start_observer(src_folder, on_change):
+    # inotify (or the platform native) events from watchdog, if installed
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            for path in [event.src_path, getattr(event, "dest_path", "")]:
+                if path:
+                    on_change(os.fsdecode(path))
+
+    observer = Observer()
+    observer.schedule(Handler(), src_folder, recursive=True)
+    observer.start()
+    return observer
+
+
+def poll_subdirs(src_folder, dc_mtimes):
+    # a directory listing changes its modification time:
+    # only the subfolders with a changed directory are listed again
+    # (linked directories are skipped, as in Ref.iter_catalog)
+    dc_current = {}
+    with os.scandir(src_folder) as entries:
+        for e in entries:
+            if e.is_dir(follow_symlinks=False) and not e.name.startswith(("_", ".")):
+                dc_current[e.name] = e.stat().st_mtime_ns
+    # nested directories found by the previous listings
+    for rel_dir in dc_mtimes:
+        if os.sep in rel_dir:
+            try:
+                dc_current[rel_dir] = os.stat(
+                    os.path.join(src_folder, rel_dir)
+                ).st_mtime_ns
+            except OSError:
+                # gone: its parent directory changed too
+                pass
+    set_changed = set(
+        rel_dir.split(os.sep)[0]
+        for rel_dir in dc_current
+        if dc_mtimes.get(rel_dir) != dc_current[rel_dir]
+    )
+    dc_mtimes.clear()
+    dc_mtimes.update(dc_current)
+    return set_changed
+
+
+def get_signature(src_folder, pair):
+    # modification time and size of both files (None if any is gone)
+    try:
+        return tuple(
+            (st.st_mtime_ns, st.st_size)
+            for st in [os.stat(os.path.join(src_folder, f)) for f in pair]
         )
+    except OSError:
+        return None
+
+
+def watch(
+    src_folder,
+    lib_folder,
+    template_folder,
+    workers=None,
+    interval=1.0,
+    settle=2.0,
+    stop=None,
+):
+    print(f"\n--- Watching refs from: {src_folder}")
+    print(f"--- Library folder: {lib_folder}")
+
+    lock = threading.Lock()
+    # subfolders to list again (all of them at start)
+    set_dirty = set(get_subdirs(src_folder=src_folder))
+
+    def on_change(path):
+        rel = os.path.relpath(path, src_folder)
+        d = rel.split(os.sep)[0]
+        if d in (".", "..") or d.startswith("_"):
+            return None
+        with lock:
+            set_dirty.add(d)
+        return None
+
+    observer = start_observer(src_folder=src_folder, on_change=on_change)
+    dc_mtimes = {}
+    if observer is None:
+        print("--- watchdog not found: polling the source folder")
+        poll_subdirs(src_folder=src_folder, dc_mtimes=dc_mtimes)
+
+    # complete pairs waiting to settle: (subdir, pair): (signature, time)
+    dc_pending = {}
+    # pairs that failed to be added: (subdir, pair): signature
+    dc_failed = {}
+    try:
+        while stop is None or not stop.is_set():
+            # 1) list the changed subfolders
+            with lock:
+                if observer is None:
+                    set_dirty.update(poll_subdirs(src_folder, dc_mtimes=dc_mtimes))
+                set_changed = set(set_dirty)
+                set_dirty.clear()
+            for d in set_changed:
+                sub_folder = os.path.join(src_folder, d)
+                if not os.path.isdir(sub_folder):
+                    continue
+                for rel_dir, pairs, orphans in Ref.iter_catalog(sub_folder):
+                    if rel_dir and observer is None:
+                        # poll the nested directory from now on
+                        dc_mtimes.setdefault(os.path.join(d, rel_dir), None)
+                    for pair in pairs:
+                        key = (d, pair)
+                        if key not in dc_pending:
+                            dc_pending[key] = (None, None)
+
+            # 2) a pair is ready once both files stop changing
+            now = time.monotonic()
+            for key in list(dc_failed):
+                # failed pairs are tried again once edited (or dropped if gone)
+                d, pair = key
+                signature = get_signature(os.path.join(src_folder, d), pair)
+                if signature != dc_failed[key]:
+                    del dc_failed[key]
+                    if signature is not None:
+                        dc_pending[key] = (signature, now)
+            dc_ready = {}
+            for key in list(dc_pending):
+                d, pair = key
+                signature = get_signature(os.path.join(src_folder, d), pair)
+                if signature is None:
+                    del dc_pending[key]
+                elif dc_failed.get(key) == signature:
+                    del dc_pending[key]
+                elif signature != dc_pending[key][0]:
+                    dc_pending[key] = (signature, now)
+                elif now - dc_pending[key][1] >= settle:
+                    dc_ready.setdefault(d, []).append((pair, signature))
+
+            # 3) add the ready pairs of each subfolder in one batch:
+            # a failure marks only the pair that failed
+            for d in sorted(dc_ready):
+                if stop is not None and stop.is_set():
+                    # not attempted: still pending
+                    break
+                tag = get_tag(d)
+                print(f"\n--- subfolder: {d} -- tag: {tag}")
+                dc_signatures = dict(dc_ready[d])
+                for pair in dc_signatures:
+                    del dc_pending[(d, pair)]
+                dc_errors = {}
+                try:
+                    add(
+                        src_folder=os.path.join(src_folder, d),
+                        lib_folder=lib_folder,
+                        template_folder=template_folder,
+                        tags=[tag],
+                        workers=workers,
+                        pairs=list(dc_signatures),
+                        errors=dc_errors,
+                    )
+                except Exception as e:
+                    # not a failure of any one pair: try them all again later
+                    print(f"--- failed: {d}: {type(e).__name__}: {e}")
+                    for pair in dc_signatures:
+                        dc_pending[(d, pair)] = (dc_signatures[pair], now)
+                    continue
+                for pair in dc_errors:
+                    dc_failed[(d, pair)] = dc_signatures[pair]
+
+            if stop is None:
+                time.sleep(interval)
+            else:
+                stop.wait(interval)
+    except KeyboardInterrupt:
+        print("\n--- stopped")
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
     return None
 
 
@@ -77,10 +282,44 @@ if __name__ == "__main__":
         required=True,
         help="Path to the folder of the note template file.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of pipeline workers (default: one ref at a time).",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and add new refs as they land in the source folder.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Seconds between checks in watch mode (default: 1.0).",
+    )
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=2.0,
+        help="Seconds a bib/pdf pair must stay unchanged before it is added in watch mode (default: 2.0).",
+    )
 
     args = parser.parse_args()
-    main(
-        src_folder=args.src_folder,
-        lib_folder=args.lib_folder,
-        template_folder=args.template_folder,
-    )
+    if args.watch:
+        watch(
+            src_folder=args.src_folder,
+            lib_folder=args.lib_folder,
+            template_folder=args.template_folder,
+            workers=args.workers,
+            interval=args.interval,
+            settle=args.settle,
+        )
+    else:
+        main(
+            src_folder=args.src_folder,
+            lib_folder=args.lib_folder,
+            template_folder=args.template_folder,
+            workers=args.workers,
+        )
@@ -2,7 +2,8 @@ import argparse
 import glob
 import os
 
-from losalamos.refs import RefNote
+from losalamos.refs import RefManifest, RefNote
+from losalamos.root import run_batch
 
 
 def update(note_file):
@@ -15,23 +16,36 @@ def update(note_file):
     n.update_head()
     n.update_tail()
 
-    # save
-    n.save()
-    file_name = os.path.basename(note_file)
-    print(f"--- updated: {file_name}")
-
-    return None
+    # save (skipped if the content did not change)
+    if n.save():
+        return "updated"
+    return "unchanged"
 
 
-def main(lib_folder):
+def main(lib_folder, workers=None, force=False):
     print(f"\n--- Updating refs from: {lib_folder}")
 
     # get list of files
     ls_files = glob.glob(f"{lib_folder}/*.md")
 
-    # run all
-    for f in ls_files:
-        update(note_file=f)
+    # skip the notes unchanged since the last refresh
+    manifest = RefManifest(lib_folder=lib_folder)
+    manifest.load()
+    manifest.prune(names=set(os.path.basename(f) for f in ls_files))
+    if force:
+        ls_todo = ls_files
+    else:
+        ls_todo = [f for f in ls_files if not manifest.is_current(f)]
+    print(f"--- {len(ls_files) - len(ls_todo)} notes unchanged since last refresh")
+
+    # run all (a failing note does not stop the others)
+    report = run_batch(func=update, items=ls_todo, workers=workers)
+
+    # record the refreshed notes
+    for dc in report["results"]:
+        if dc["ok"]:
+            manifest.record(dc["item"])
+    manifest.save()
 
     print("\n ok.")
     return None
@@ -45,5 +59,16 @@ if __name__ == "__main__":
         required=True,
         help="Path to the library folder where reference notes are expected.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: one note at a time).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Refresh all notes, including the ones unchanged since last refresh.",
+    )
     args = parser.parse_args()
-    main(lib_folder=args.lib_folder)
+    main(lib_folder=args.lib_folder, workers=args.workers, force=args.force)
@@ -1,6 +1,7 @@
 import argparse
 import glob
 
+from losalamos.root import run_batch
 from losalamos.zion import Sapiens
 
 
@@ -13,24 +14,20 @@ def update(note_file):
     # update only head
     n.update_head()
 
-    # save
-    n.save()
+    # save (skipped if the content did not change)
+    if n.save():
+        return "updated"
+    return "unchanged"
 
-    file_name = n.metadata["name"]
-    print(f"--- updated: {file_name}")
 
-    return None
-
-
-def main(lib_folder):
+def main(lib_folder, workers=None):
     print(f"\n--- Updating sapiens from: {lib_folder}")
 
     # get list of files
     ls_files = glob.glob(f"{lib_folder}/*.md")
 
-    # run all
-    for f in ls_files:
-        update(note_file=f)
+    # run all (a failing note does not stop the others)
+    run_batch(func=update, items=ls_files, workers=workers)
 
     print("\n ok.")
     return None
@@ -44,5 +41,11 @@ if __name__ == "__main__":
         required=True,
         help="Path to the folder where sapiens notes are expected.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: one note at a time).",
+    )
     args = parser.parse_args()
-    main(lib_folder=args.lib_folder)
+    main(lib_folder=args.lib_folder, workers=args.workers)
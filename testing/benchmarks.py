@@ -0,0 +1,1044 @@
+"""
+Benchmarks for the performance-sensitive routines of ``losalamos``.
+
+Run from the repository root, for instance:
+
+.. code-block:: bash
+
+    python -m testing.benchmarks tokenizer
+
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from losalamos.refs import Ref, RefColl, RefNote, RefNoteCache
+from losalamos.root import Collection, MbaE, Note, run_batch
+
+# ****** HELPERS ******
+
+
+def make_bib_dict(i):
+    """Get a synthetic BibTeX dictionary"""
+    return {
+        "entry_type": "article",
+        "citation_key": f"Author{1950 + i % 70}{i}",
+        "author": f"Author, First and Second, Middle and Third, Last{i}",
+        "journal": "Journal of Synthetic Hydrology",
+        "pages": f"{i % 900}-{i % 900 + 15}",
+        "publisher": "Elsevier",
+        "title": f"On the {{GLUE}} methodology for synthetic entry number {i}",
+        "volume": str(i % 120),
+        "year": str(1950 + i % 70),
+        "doi": f"10.1000/synthetic.{i}",
+        "abstract": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+    }
+
+
+def make_bib_file(file_bib, size):
+    """Write a ``bib`` file with ``size`` synthetic entries"""
+    with open(file_bib, "w", encoding="utf-8") as file:
+        for i in range(size):
+            bib_dict = make_bib_dict(i)
+            file.write(f"@article{{{bib_dict['citation_key']},\n")
+            for k in bib_dict:
+                if k not in ["entry_type", "citation_key"]:
+                    file.write(f"   {k} = {{{bib_dict[k]}}},\n")
+            file.write("}\n")
+    return file_bib
+
+
+def make_note_file(file_note, i):
+    """Write a reference note with a synthetic BibTeX entry in the tail"""
+    bib_str = Ref.bib_to_str(bib_dict=make_bib_dict(i))
+    lines = ["---", f"citation_key: Author{i}", "---", "", "head", "", "---"]
+    lines = lines + ["", "# Overview", "body", "", "---", "", "## BibTeX entry"]
+    lines = lines + ["```", bib_str, "```"]
+    with open(file_note, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+    return file_note
+
+
+def make_inbox(folder, size, file_pdf):
+    """Write ``size`` pairs of ``bib`` and ``pdf`` files, one book for every ten"""
+    os.makedirs(folder, exist_ok=True)
+    for i in range(size):
+        bib_dict = make_bib_dict(i)
+        if i % 10 == 0:
+            bib_dict["entry_type"] = "book"
+        bib_dict["author"] = f"Smith, John{i % 4}"
+        with open(f"{folder}/ref{i:05d}.bib", "w", encoding="utf-8") as file:
+            file.write(Ref.bib_to_str(bib_dict=bib_dict))
+        shutil.copy(file_pdf, f"{folder}/ref{i:05d}.pdf")
+    return folder
+
+
+def make_templates(folder):
+    """Write minimal note templates for articles and books"""
+    n = RefNote()
+    for entry_type in ["article", "book"]:
+        lines = ["---"]
+        for e in n.metadata_entries[entry_type]:
+            if e == "entry_type":
+                lines.append(f"entry_type: {entry_type}")
+            elif e == "tags":
+                lines = lines + ["tags:", "  - science"]
+            else:
+                lines.append(f"{e}:")
+        lines = lines + ["---", "", "head", "", "---", "# Overview", "", "body", ""]
+        file_template = f"{folder}/{n.template_filenames[entry_type]}"
+        with open(file_template, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines))
+    return folder
+
+
+def serve_dois(latency=0.05):
+    """Start a local stand-in for the DOI resolver.
+
+    ``GET /<doi>`` answers the BibTeX of the synthetic entry numbered by the DOI suffix.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(latency)
+            i = int(self.path.rsplit(".", 1)[-1])
+            body = Ref.bib_to_str(bib_dict=make_bib_dict(i)).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-bibtex")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def timeit(func, *args):
+    """Get the elapsed seconds and the output of a call"""
+    t0 = time.perf_counter()
+    out = func(*args)
+    return time.perf_counter() - t0, out
+
+
+def report(label, size, seconds):
+    print(f"{label:<40} {size:>8} entries {seconds:>8.3f} s {size / seconds:>12.0f} /s")
+
+
+# ****** BASELINES ******
+# Parsers as they were before the shared tokenizer, kept for comparison
+
+
+def legacy_parse_bibtex(file_bib):
+    entries = []
+    entry = None
+    key = None
+    with open(file_bib, "r", encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("%"):
+                continue
+            if line.startswith("@"):
+                if entry is not None:
+                    entries.append(entry)
+                entry = {}
+                entry_type, citation_key = line.lstrip("@").split("{", 1)
+                entry["entry_type"] = entry_type
+                entry["citation_key"] = citation_key.rstrip(",").strip()
+            elif "=" in line and entry is not None:
+                key, value = line.split("=", 1)
+                key = key.strip().lower()
+                value = value.strip().strip("{").strip(",").strip("}")
+                entry[key] = value
+            elif entry is not None and key:
+                entry[key] += " " + line.strip().strip("{").strip("}").strip(",")
+    if entry is not None:
+        entries.append({k: entry[k].strip() for k in entry})
+    return [{k: v.strip() for k, v in item.items()} for item in entries]
+
+
+def legacy_bibstr_to_dict(bibtex_str):
+    entry_pattern = re.compile(r"@\w+\{")
+    key_pattern = re.compile(r"@\w+\{(.+?),")
+    field_pattern = re.compile(r'(\w+)\s*=\s*[{"](.*?)[}"],?', re.DOTALL)
+    entry_type_match = entry_pattern.search(bibtex_str)
+    key_match = key_pattern.search(bibtex_str)
+    bib_dict = {
+        "entry_type": entry_type_match.group()[1:-1],
+        "citation_key": key_match.group(1),
+    }
+    for key, value in field_pattern.findall(bibtex_str):
+        bib_dict[key.strip()] = value.strip()
+    return bib_dict
+
+
+def legacy_update_details(c):
+    """Former ``Collection.update(details=True)``: one concat per object"""
+    df_new_catalog = pd.DataFrame(columns=c.catalog.columns)
+    for name in c.collection:
+        dct_meta = c.collection[name].get_metadata()
+        df_aux = pd.DataFrame({k: [dct_meta[k]] for k in dct_meta})
+        df_new_catalog = pd.concat([df_new_catalog, df_aux], ignore_index=True)
+    c.catalog = df_new_catalog.copy()
+    c.update()
+
+
+class LegacyRef(Ref):
+    """Former ``Ref`` layout: an instance ``__dict__`` holding the data and
+    every field name, as set by ``_set_fields`` on each instance"""
+
+    def _set_fields(self):
+        self.name_field = "Name"
+        self.alias_field = "Alias"
+        self.mdata_attr_field = "Attribute"
+        self.mdata_val_field = "Value"
+        self.citation_key_field = "citation_key"
+        self.type_field = "entry_type"
+        self.title_field = "title"
+        self.author_field = "author"
+        self.year_field = "year"
+        self.file_bib_field = "file_bib"
+        self.file_note_field = "file_note"
+        self.file_doc_field = "file_doc"
+
+
+def legacy_note_to_file(note, file_path):
+    """Former ``Note.to_file``: write, then read back and rewrite to collapse
+    blank lines"""
+    ls_metadata = Note.metadata_to_list(note.metadata)
+    ls_metadata = [line.replace("None", "") for line in ls_metadata]
+    ls_all = [line + "\n" for line in ls_metadata + Note.data_to_list(note.data)]
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.writelines(ls_all)
+    with open(file_path, "r", encoding="utf-8") as file:
+        lines = file.readlines()
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.writelines(Note.collapse_blank_lines(lines))
+
+
+def legacy_parse_metadata(note_file):
+    """Former ``Note.parse_metadata``: read the whole file and search it"""
+    with open(note_file, "r", encoding="utf-8") as file:
+        content = file.read()
+    return Note.parse_metadata_text(content)
+
+
+def legacy_parse_yaml(yaml_content):
+    """Former ``Note.parse_yaml``: line loop plus two fix-up passes"""
+    metadata = {}
+    current_list = None
+    for line in yaml_content.split("\n"):
+        if line.strip() == "":
+            continue
+        if ":" in line:
+            key, value = line.split(":", 1)
+            key = key.strip()
+            value = value.strip()
+            if value == "":
+                current_list = []
+                metadata[key] = current_list
+            elif key == "tags":
+                metadata[key] = [v.strip() for v in value.split("-") if v.strip()]
+            else:
+                metadata[key] = value
+        elif current_list is not None and line.strip().startswith("-"):
+            current_list.append(line.strip()[1:].strip())
+    for e in metadata:
+        if len(metadata[e]) == 0:
+            metadata[e] = None
+    for e in metadata:
+        if metadata[e]:
+            size = len(metadata[e]) - 1
+            if metadata[e][0] == '"' and metadata[e][size] == '"':
+                metadata[e] = metadata[e][1:size]
+    return metadata
+
+
+def make_yaml_header(i):
+    """Get the front matter (no delimiters) of a synthetic reference note"""
+    bib_dict = make_bib_dict(i)
+    lines = []
+    for k, v in bib_dict.items():
+        if k == "abstract":
+            v = f'"{v}"'
+        lines.append(f"{k}: {v}")
+    lines = lines + ["number:", "issn: ", f'file: "[[{bib_dict["citation_key"]}.pdf]]"']
+    lines = lines + ["tags:"] + [f" - tag{j}" for j in range(i % 5)]
+    lines = lines + [f"related:", f' - "[[Note {i}]]"', "timestamp: 2024-01-01 10:00"]
+    if i % 3 == 0:
+        lines.append("tags: - hydrology - ecology")
+    return "\n".join(lines)
+
+
+def legacy_get_bib(file_path):
+    with open(file_path, "r", encoding="utf-8") as file:
+        lines = file.readlines()
+    in_bibtex = False
+    bibtex_lines = []
+    for line in lines:
+        if line.strip().startswith("@"):
+            in_bibtex = True
+            entry_type, rest = line.strip()[1:].split("{", 1)
+            citation_key, rest = rest.split(",", 1)
+            bibtex_lines.append(rest.strip())
+        elif in_bibtex:
+            bibtex_lines.append(line.strip())
+            if line.strip().endswith("}}"):
+                break
+    if not in_bibtex:
+        return None
+    fields_raw = " ".join(bibtex_lines).rstrip("}}").strip()
+    fields_raw = re.sub(r",\s*}", "}", fields_raw)
+    fields_raw += ","
+    fields_pattern = re.compile(r"(\w+)\s*=\s*\{(.*?)\},", re.DOTALL)
+    bibtex_dict = {"entry_type": entry_type, "citation_key": citation_key}
+    for key, value in fields_pattern.findall(fields_raw):
+        bibtex_dict[key.strip()] = value.strip()
+    return bibtex_dict
+
+
+# ****** BENCHMARKS ******
+
+
+def bench_tokenizer(size=50000, notes=2000):
+    """Entries per second of the BibTeX entry points against the former parsers"""
+    print(f"\n--- BibTeX tokenizer ({size} entries, {notes} notes)")
+    with tempfile.TemporaryDirectory() as tmp:
+        file_bib = make_bib_file(os.path.join(tmp, "corpus.bib"), size)
+
+        # whole files
+        t, _ = timeit(legacy_parse_bibtex, file_bib)
+        report("parse_bibtex (legacy)", size, t)
+        t, _ = timeit(Ref.parse_bibtex, file_bib)
+        report("parse_bibtex", size, t)
+        t, _ = timeit(lambda f: sum(1 for e in Ref.iter_bibtex(f)), file_bib)
+        report("iter_bibtex", size, t)
+
+        # single strings
+        lst_str = [Ref.bib_to_str(bib_dict=make_bib_dict(i)) for i in range(size)]
+        t, _ = timeit(lambda ls: [legacy_bibstr_to_dict(s) for s in ls], lst_str)
+        report("bibstr_to_dict (legacy)", size, t)
+        t, _ = timeit(lambda ls: [Ref.bibstr_to_dict(s) for s in ls], lst_str)
+        report("bibstr_to_dict", size, t)
+
+        # notes
+        lst_notes = [
+            make_note_file(os.path.join(tmp, f"note{i}.md"), i) for i in range(notes)
+        ]
+        t, _ = timeit(lambda ls: [legacy_get_bib(f) for f in ls], lst_notes)
+        report("RefNote.get_bib (legacy)", notes, t)
+        t, _ = timeit(lambda ls: [RefNote.get_bib(f) for f in ls], lst_notes)
+        report("RefNote.get_bib", notes, t)
+
+
+def bench_doi(size=80, workers=8, latency=0.05):
+    """Sequential against concurrent DOI resolution on a local stand-in server"""
+    print(f"\n--- DOI resolution ({size} DOIs, {latency} s latency, {workers} workers)")
+    server = serve_dois(latency=latency)
+    doi_url = f"http://127.0.0.1:{server.server_port}"
+    lst_dois = [make_bib_dict(i)["doi"] for i in range(size)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        t1, lst_seq = timeit(
+            lambda ls: [Ref.query_doi(doi=d, doi_url=doi_url) for d in ls], lst_dois
+        )
+        t2, lst_con = timeit(
+            lambda ls: Ref.query_dois(dois=ls, workers=workers, doi_url=doi_url),
+            lst_dois,
+        )
+    server.shutdown()
+    report("query_doi (sequential)", size, t1)
+    report("query_dois", size, t2)
+    print(f"same results in the same order: {lst_seq == lst_con}")
+
+
+def bench_ingest(size=400, workers=8, pages=20):
+    """Sequential against pipelined ingestion of an inbox with ``add_bat``"""
+    import fitz  # PyMuPDF
+
+    print(f"\n--- Inbox ingestion ({size} pairs, {pages} pages, {workers} workers)")
+    with tempfile.TemporaryDirectory() as tmp:
+        file_pdf = f"{tmp}/sample.pdf"
+        doc = fitz.open()
+        for i in range(pages):
+            doc.new_page().insert_text((72, 72), f"page {i} " * 20)
+        doc.save(file_pdf)
+        template_folder = make_templates(tmp)
+        for label, w in [("add_bat (sequential)", None), ("add_bat", workers)]:
+            src_folder = make_inbox(f"{tmp}/inbox_{w}", size, file_pdf)
+            lib_folder = f"{tmp}/lib_{w}"
+            os.makedirs(lib_folder)
+            with contextlib.redirect_stdout(io.StringIO()):
+                t, dc_stages = timeit(
+                    lambda: Ref.add_bat(
+                        src_folder=src_folder,
+                        lib_folder=lib_folder,
+                        template_folder=template_folder,
+                        clean=True,
+                        workers=w,
+                    )
+                )
+            report(label, size, t)
+        for stage in dc_stages:
+            report(
+                f"  stage {stage}",
+                dc_stages[stage]["count"],
+                dc_stages[stage]["seconds"],
+            )
+        lst_seq = sorted(os.listdir(f"{tmp}/lib_None"))
+        print(f"same library files: {lst_seq == sorted(os.listdir(lib_folder))}")
+
+
+def bench_template(size=5000):
+    """Template parsing for every note against the template cache"""
+    print(f"\n--- Note templates ({size} notes)")
+
+    def legacy_load(file_template):
+        n = RefNote()
+        n.file_note = file_template
+        n.load()
+        return n
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_template = f"{make_templates(tmp)}/{RefNote.template_filenames['article']}"
+        with open(file_template, "a", encoding="utf-8") as file:
+            file.write("\n".join(f"- [ ] reading task {i}" for i in range(200)))
+        t, _ = timeit(lambda: [legacy_load(file_template) for i in range(size)])
+        report("RefNote.load (legacy)", size, t)
+        t, _ = timeit(
+            lambda: [RefNote.load_template(file_template) for i in range(size)]
+        )
+        report("RefNote.load_template", size, t)
+
+
+def make_library(folder, size):
+    """Write ``size`` reference notes (and a PDF for every third) with ``to_note``"""
+    os.makedirs(folder, exist_ok=True)
+    template_folder = make_templates(folder)
+    file_template = f"{template_folder}/{RefNote.template_filenames['article']}"
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(size):
+            r = Ref()
+            r.bib_dict = make_bib_dict(i)
+            r.author = r.bib_dict["author"]
+            r.year = r.bib_dict["year"]
+            r.to_note(output_dir=folder, note_template=file_template, filename=f"n{i}")
+            if i % 3 == 0:
+                open(f"{folder}/n{i}.pdf", "w").close()
+    return folder
+
+
+def bench_library_read(size=3000):
+    """Reading the reference notes of a library: three passes against one"""
+    print(f"\n--- Library notes ({size} notes)")
+
+    def legacy_read(lib_folder):
+        for f in glob.glob(f"{lib_folder}/*.md"):
+            r = Ref()
+            r.bib_dict = RefNote.get_bib(f)
+            r.file_note = f
+            pdf = os.path.join(os.path.dirname(f), os.path.basename(f)[:-3] + ".pdf")
+            if os.path.isfile(pdf):
+                r.file_doc = pdf
+            r.load_note()
+
+    def read(lib_folder):
+        ls_names = os.listdir(lib_folder)
+        set_pdfs = set(f for f in ls_names if f.endswith(".pdf"))
+        for name in ls_names:
+            if name.endswith(".md") and not name.startswith("_"):
+                f = os.path.join(lib_folder, name)
+                scan = RefNote.scan_note(f)
+                r = Ref()
+                r.bib_dict = scan["bib_dict"]
+                r.file_note = f
+                if name[:-3] + ".pdf" in set_pdfs:
+                    r.file_doc = os.path.join(lib_folder, name[:-3] + ".pdf")
+                r.load_note(scan=scan)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        lib_folder = make_library(f"{tmp}/lib", size)
+        for f in glob.glob(f"{lib_folder}/_*.md"):
+            os.remove(f)
+        t, _ = timeit(legacy_read, lib_folder)
+        report("get_bib + load_note (legacy)", size, t)
+        t, _ = timeit(read, lib_folder)
+        report("scan_note + load_note(scan)", size, t)
+
+
+def bench_library_cache(size=10000):
+    """Parsing the notes of an unchanged library: cold against warm cache"""
+    print(f"\n--- Library note cache ({size} notes)")
+
+    def scan_all(lib_folder):
+        cache = RefNoteCache(lib_folder=lib_folder)
+        cache.load()
+        for e in os.scandir(lib_folder):
+            if e.name.endswith(".md"):
+                cache.scan(e.path, stat=e.stat())
+        cache.save()
+        return cache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        lib_folder = make_library(f"{tmp}/lib", size)
+        t, _ = timeit(scan_all, lib_folder)
+        report("RefNoteCache (cold)", size, t)
+        t, _ = timeit(scan_all, lib_folder)
+        report("RefNoteCache (warm)", size, t)
+        os.utime(f"{lib_folder}/n0.md")
+        t, _ = timeit(scan_all, lib_folder)
+        report("RefNoteCache (warm, one changed)", size, t)
+        size_mb = os.path.getsize(f"{lib_folder}/_notes.pkl") / 1e6
+        print(f"cache file: {size_mb:.1f} MB")
+
+
+def bench_collection(sizes=(1000, 10000, 100000), append_max=10000):
+    """Collection.append in a loop against Collection.extend and from_records"""
+    print(f"\n--- Collection ingestion (append up to {append_max} objects)")
+    for size in sizes:
+        lst_objects = [MbaE(name=f"Thing{i}", alias=f"T{i}") for i in range(size)]
+        lst_records = [{"Name": f"Thing{i}", "Alias": f"T{i}"} for i in range(size)]
+        if size <= append_max:
+            c = Collection(base_object=MbaE)
+            t, _ = timeit(lambda: [c.append(o) for o in lst_objects])
+            report("Collection.append (loop)", size, t)
+        c = Collection(base_object=MbaE)
+        t, _ = timeit(c.extend, lst_objects)
+        report("Collection.extend", size, t)
+        c = Collection(base_object=MbaE)
+        t, _ = timeit(c.from_records, lst_records)
+        report("Collection.from_records", size, t)
+
+
+def bench_collection_ops(size=10000, ops=500):
+    """Single appends and removals on a large Collection, with and without
+    reading the catalog after each operation (the former eager behaviour)"""
+    print(f"\n--- Collection single operations ({ops} appends and removals on {size})")
+
+    def run(c, access):
+        for i in range(ops):
+            c.append(MbaE(name=f"New{i}", alias=f"N{i}"))
+            if access:
+                c.catalog
+        for i in range(ops):
+            c.remove(name=f"Thing{i}")
+            if access:
+                c.catalog
+        return c.catalog
+
+    lst_objects = [MbaE(name=f"Thing{i}", alias=f"T{i}") for i in range(size)]
+    for label, access in [("catalog read every operation", True), ("deferred", False)]:
+        c = Collection(base_object=MbaE)
+        c.extend(lst_objects)
+        c.catalog
+        t, df = timeit(run, c, access)
+        report(label, 2 * ops, t)
+    print(f"final size: {len(df)} rows")
+
+
+def refcoll_memory(size, copy_objects):
+    """Build a ``RefColl`` of ``size`` references with loaded notes and print
+    the peak RSS (MB) after imports and at the end, and the elapsed seconds.
+    Meant to run in a fresh interpreter (see :func:`bench_memory`)."""
+    import resource
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_note = make_library(tmp, 1) + "/n0.md"
+        scan = RefNote.scan_note(file_note)
+    rss0 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    t0 = time.perf_counter()
+    lst_refs = []
+    for i in range(size):
+        r = Ref()
+        r.bib_dict = make_bib_dict(i)
+        r.name = f"Ref{i}"
+        r.alias = f"R{i}"
+        r.file_note = file_note
+        # every note has its own (distinct) sections
+        r.load_note(scan={k: scan[k] for k in ["metadata", "data"]})
+        r.note.data = {
+            k: [f"{line} {i}" for line in v] for k, v in scan["data"].items()
+        }
+        lst_refs.append(r)
+    c = RefColl(copy_objects=copy_objects)
+    for r in lst_refs:
+        c.append(r)
+    c.catalog
+    t = time.perf_counter() - t0
+    rss1 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{rss0:.1f} {rss1:.1f} {t:.3f}")
+
+
+def bench_memory(size=10000):
+    """Peak RSS of a ``RefColl`` with loaded notes: copy against reference mode"""
+    import subprocess
+    import sys
+
+    print(f"\n--- RefColl memory ({size} references with notes)")
+    for label, copy_objects in [("copy mode", True), ("reference mode", False)]:
+        code = "from testing.benchmarks import refcoll_memory; "
+        code = code + f"refcoll_memory({size}, {copy_objects})"
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        rss0, rss1, t = [float(v) for v in out.stdout.split()]
+        report(label, size, t)
+        print(f"{'':<40} peak RSS {rss1:8.1f} MB ({rss1 - rss0:+.1f} MB)")
+
+
+def bench_find(size=100000, lookups=200):
+    """Lookups by catalog fields: pandas filters against indexes"""
+    print(f"\n--- Collection lookups ({lookups} lookups on {size} references)")
+    lst_refs = []
+    for i in range(size):
+        bib_dict = make_bib_dict(i)
+        r = Ref(
+            entry_type=bib_dict["entry_type"],
+            title=bib_dict["title"],
+            author=bib_dict["author"],
+            year=bib_dict["year"],
+            citation_key=bib_dict["citation_key"],
+        )
+        r.name = bib_dict["citation_key"]
+        lst_refs.append(r)
+    c = RefColl(copy_objects=False)
+    c.extend(lst_refs)
+    lst_keys = [lst_refs[(i * 7919) % size].citation_key for i in range(lookups)]
+    lst_years = [(str(1950 + i % 60), str(1955 + i % 60)) for i in range(lookups)]
+
+    def filter_keys():
+        df = c.catalog
+        return [df[df["citation_key"] == k] for k in lst_keys]
+
+    def filter_years():
+        df = c.catalog
+        return [df[(df["year"] >= y0) & (df["year"] <= y1)] for y0, y1 in lst_years]
+
+    t, _ = timeit(filter_keys)
+    report("citation_key: catalog filter", lookups, t)
+    t, _ = timeit(c.create_index, "citation_key")
+    report("citation_key: create_index", size, t)
+    t, _ = timeit(lambda: [c.find(citation_key=k) for k in lst_keys])
+    report("citation_key: find (hash)", lookups, t)
+    t, _ = timeit(filter_years)
+    report("year range: catalog filter", lookups, t)
+    t, _ = timeit(c.create_index, "year", "sorted")
+    report("year range: create_index", size, t)
+    t, _ = timeit(lambda: [c.find(year=y) for y in lst_years])
+    report("year range: find (sorted)", lookups, t)
+
+
+def bench_update(size=5000, dirty=50):
+    """Collection.update(details=True): per-row concat against a single build,
+    and against refreshing only the objects marked dirty"""
+    print(f"\n--- Collection.update(details=True) on {size} references")
+    lst_refs = []
+    for i in range(size):
+        bib_dict = make_bib_dict(i)
+        r = Ref(title=bib_dict["title"], author=bib_dict["author"])
+        r.name = bib_dict["citation_key"]
+        lst_refs.append(r)
+    c = RefColl(copy_objects=False)
+    c.extend(lst_refs)
+
+    t, _ = timeit(legacy_update_details, c)
+    report("former per-row concat", size, t)
+    t, _ = timeit(lambda: (c.update(details=True), c.catalog))
+    report("single build", size, t)
+    lst_names = sorted(c.collection)[:: size // dirty][:dirty]
+    for name in lst_names:
+        c.collection[name].alias = name.upper()
+        c.mark_dirty(name)
+    t, _ = timeit(lambda: (c.update(details=True, dirty_only=True), c.catalog))
+    report(f"dirty only ({dirty} objects)", dirty, t)
+
+
+def bench_record_size(size=50000):
+    """Bytes per ``Ref``: per-instance field names against class-level
+    fields and ``__slots__``"""
+    import tracemalloc
+
+    print(f"\n--- Ref record size ({size} references)")
+    lst_bibs = [make_bib_dict(i) for i in range(size)]
+    for label, cls in [("instance dict and fields", LegacyRef), ("slots", Ref)]:
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        lst_refs = []
+        for bib_dict in lst_bibs:
+            r = cls(
+                entry_type=bib_dict["entry_type"],
+                title=bib_dict["title"],
+                author=bib_dict["author"],
+                year=bib_dict["year"],
+                citation_key=bib_dict["citation_key"],
+            )
+            r.bib_dict = bib_dict
+            lst_refs.append(r)
+        t = time.perf_counter() - t0
+        n_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        report(label, size, t)
+        print(f"{'':<40} {n_bytes / size:8.0f} bytes per Ref")
+        del lst_refs
+
+
+def make_datasets(folder, size):
+    """Write ``size`` small data files, one ``Attribute;Value`` boot file for
+    each, and one wide boot table for all; return the boot file paths and
+    the table path"""
+    lst_bootfiles = []
+    lst_rows = []
+    for i in range(size):
+        file_data = f"data{i}.csv"
+        with open(os.path.join(folder, file_data), "w") as f:
+            f.write("P;RM;TempDB\n")
+            f.writelines(f"{j};{j / 2};{20 + j % 5}\n" for j in range(10))
+        row = {
+            "Name": f"DataSet{i}",
+            "Alias": f"DS{i}",
+            "Color": "blue",
+            "Source": "Station",
+            "Description": "Daily data",
+            "File_Data": file_data,
+        }
+        lst_rows.append(row)
+        bootfile = os.path.join(folder, f"boot{i}.csv")
+        with open(bootfile, "w") as f:
+            f.write("Attribute;Value\n")
+            f.writelines(f"{k};{v}\n" for k, v in row.items())
+        lst_bootfiles.append(bootfile)
+    file_table = os.path.join(folder, "boot_table.csv")
+    pd.DataFrame(lst_rows).to_csv(file_table, sep=";", index=False)
+    return lst_bootfiles, file_table
+
+
+def bench_boot(size=500):
+    """DataSet objects booted one file each against Collection.boot_many"""
+    from losalamos.root import DataSet
+
+    print(f"\n--- Booting {size} DataSet objects")
+    with tempfile.TemporaryDirectory() as tmp:
+        lst_bootfiles, file_table = make_datasets(tmp, size)
+
+        def boot_each(load_data):
+            c = Collection(base_object=DataSet, copy_objects=False)
+            for bootfile in lst_bootfiles:
+                ds = DataSet()
+                if load_data:
+                    ds.boot(bootfile=bootfile)
+                else:
+                    # boot() always loads data: emulate it without loading
+                    df = pd.read_csv(bootfile, sep=";")
+                    ds.bootfile = bootfile
+                    ds.folder_bootfile = os.path.dirname(bootfile)
+                    ds.set(dict(zip(df["Attribute"], df["Value"])), load_data=False)
+                c.append(ds)
+            return c.catalog
+
+        def boot_many(load_data):
+            c = Collection(base_object=DataSet, copy_objects=False)
+            c.boot_many(table=file_table, load_data=load_data)
+            return c.catalog
+
+        for load_data in [True, False]:
+            str_data = "with data" if load_data else "metadata only"
+            t, df1 = timeit(boot_each, load_data)
+            report(f"boot per object ({str_data})", size, t)
+            t, df2 = timeit(boot_many, load_data)
+            report(f"boot_many ({str_data})", size, t)
+            assert df1.equals(df2)
+
+
+def bench_importtime(scripts=("refs_add.py", "refs_update.py", "sapiens_update.py")):
+    """Startup import cost of the entry-point scripts, from ``python -X importtime``"""
+    import subprocess
+    import sys
+
+    print("\n--- Import time of the entry-point scripts (--help)")
+    folder_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for script in scripts:
+        out = subprocess.run(
+            [sys.executable, "-X", "importtime", script, "--help"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=folder_root,
+        )
+        # lines: "import time: self [us] | cumulative | imported package"
+        lst_top = []
+        for line in out.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:") :].split("|")
+            # top-level imports are not indented
+            if not name[1:].startswith(" "):
+                lst_top.append((int(cumulative) / 1e6, name.strip()))
+        seconds = sum(t for t, _ in lst_top)
+        lst_top.sort(reverse=True)
+        str_top = ", ".join(f"{name} {t:.3f} s" for t, name in lst_top[:3])
+        print(f"{script:<24} {seconds:8.3f} s   ({str_top})")
+
+
+def bench_note_write(size=3000):
+    """Saving loaded notes: former write and rewrite against a single write,
+    and against saving unchanged notes"""
+    print(f"\n--- Saving {size} reference notes")
+    with tempfile.TemporaryDirectory() as tmp:
+        make_library(tmp, size)
+        lst_notes = []
+        for i in range(size):
+            n = RefNote()
+            n.file_note = f"{tmp}/n{i}.md"
+            n.load()
+            lst_notes.append(n)
+        # write elsewhere so that every note is new
+        folder_out = f"{tmp}/out"
+        os.makedirs(folder_out)
+        t, _ = timeit(
+            lambda: [
+                legacy_note_to_file(n, f"{folder_out}/n{i}.md")
+                for i, n in enumerate(lst_notes)
+            ]
+        )
+        report("former write and rewrite", size, t)
+        shutil.rmtree(folder_out)
+        os.makedirs(folder_out)
+        t, lst_written = timeit(
+            lambda: [
+                n.to_file(f"{folder_out}/n{i}.md") for i, n in enumerate(lst_notes)
+            ]
+        )
+        report(f"single write ({sum(lst_written)} written)", size, t)
+        # same notes again: nothing to write
+        t, lst_written = timeit(
+            lambda: [
+                n.to_file(f"{folder_out}/n{i}.md") for i, n in enumerate(lst_notes)
+            ]
+        )
+        report(f"unchanged ({sum(lst_written)} written)", size, t)
+
+
+def bench_front_matter(size=2000, text_lines=2000):
+    """Reading the front matter of notes with long bodies: whole file against
+    header only, and ``load_library`` against its metadata-only mode"""
+    print(f"\n--- Front matter of {size} notes with {text_lines} lines of pasted text")
+    with tempfile.TemporaryDirectory() as tmp:
+        make_library(tmp, size)
+        lst_files = sorted(glob.glob(f"{tmp}/*.md"))
+        str_text = "Lorem ipsum dolor sit amet, consectetur adipiscing elit.\n"
+        for f in lst_files:
+            with open(f, "a", encoding="utf-8") as file:
+                file.write("\n# Full text\n\n" + str_text * text_lines)
+
+        t, lst_old = timeit(lambda: [legacy_parse_metadata(f) for f in lst_files])
+        report("parse_metadata: whole file", size, t)
+        t, lst_new = timeit(lambda: [Note.parse_metadata(f) for f in lst_files])
+        report("parse_metadata: header only", size, t)
+        assert lst_old == lst_new
+
+        for label, metadata_only in [("load_library", False), ("metadata_only", True)]:
+            c = RefColl(copy_objects=False)
+            t, _ = timeit(lambda: (c.load_library(tmp, metadata_only=metadata_only)))
+            report(label, size, t)
+
+
+def bench_yaml(size=10000, repeat=5):
+    """Front matter parsing: former line loop and fix-up passes against the
+    single-pass parser"""
+    print(f"\n--- YAML front matter ({size} synthetic headers, {repeat} passes)")
+    lst_headers = [make_yaml_header(i) for i in range(size)]
+
+    def parse_all(parse_yaml):
+        for _ in range(repeat):
+            for h in lst_headers:
+                parse_yaml(h)
+
+    t, _ = timeit(parse_all, legacy_parse_yaml)
+    report("former parse_yaml", size * repeat, t)
+    t, _ = timeit(parse_all, Note.parse_yaml)
+    report("single pass", size * repeat, t)
+    lst_old = [legacy_parse_yaml(h) for h in lst_headers]
+    print(f"same output: {lst_old == [Note.parse_yaml(h) for h in lst_headers]}")
+
+
+def bench_batch(size=2000, workers=(1, 2, 4)):
+    """refs_update.py: a loop over the notes against run_batch"""
+    import refs_update
+
+    print(f"\n--- Updating {size} reference notes (cpu count: {os.cpu_count()})")
+    with tempfile.TemporaryDirectory() as tmp:
+        make_library(f"{tmp}/lib", size)
+
+        def fresh_files():
+            # a fresh copy of the library for each run (every note gets updated)
+            shutil.rmtree(f"{tmp}/run", ignore_errors=True)
+            shutil.copytree(f"{tmp}/lib", f"{tmp}/run")
+            return sorted(glob.glob(f"{tmp}/run/n*.md"))
+
+        def loop(lst_files):
+            with contextlib.redirect_stdout(io.StringIO()):
+                for f in lst_files:
+                    refs_update.update(note_file=f)
+
+        t, _ = timeit(loop, fresh_files())
+        report("loop", size, t)
+        for n in workers:
+            lst_files = fresh_files()
+            with contextlib.redirect_stdout(io.StringIO()):
+                t, dct_report = timeit(
+                    lambda: run_batch(refs_update.update, lst_files, workers=n)
+                )
+            report(f"run_batch (workers: {n})", size, t)
+            assert dct_report["counts"] == {"updated": size}
+
+
+def bench_refresh(size=5000, changed=50):
+    """refs_update.py: a full refresh against the manifest refresh"""
+    import refs_update
+
+    print(f"\n--- Refreshing {size} reference notes ({changed} changed)")
+    with tempfile.TemporaryDirectory() as tmp:
+        lib = f"{tmp}/lib"
+        make_library(lib, size)
+        lst_files = sorted(glob.glob(f"{lib}/n*.md"))
+
+        def refresh(force):
+            with contextlib.redirect_stdout(io.StringIO()):
+                refs_update.main(lib_folder=lib, force=force)
+
+        # first run renders all notes and writes the manifest
+        refresh(force=True)
+        t, _ = timeit(lambda: refresh(force=True))
+        report("full refresh (stable library)", size, t)
+        t, _ = timeit(lambda: refresh(force=False))
+        report("manifest (stable library)", size, t)
+
+        # edit the front matter of a few notes
+        for f in lst_files[:changed]:
+            with open(f, "r", encoding="utf-8") as file:
+                content = file.read()
+            with open(f, "w", encoding="utf-8") as file:
+                file.write(content.replace("year: ", "year: 1", 1))
+        t, _ = timeit(lambda: refresh(force=False))
+        report(f"manifest ({changed} changed)", size, t)
+        n = RefNote()
+        n.file_note = lst_files[0]
+        n.load()
+        assert f"({n.metadata['year']})" in "\n".join(n.data["Tail"])
+
+
+def bench_watch(subdirs=200, files=50, ticks=20):
+    """refs_add.py: polling the inbox tree against listing every subfolder"""
+    import refs_add
+
+    print(
+        f"\n--- Inbox tree ({subdirs} subfolders, {files} files each, {ticks} checks)"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(subdirs):
+            os.makedirs(f"{tmp}/d{i}")
+            for j in range(files):
+                open(f"{tmp}/d{i}/f{j}.{['bib', 'pdf', 'txt'][j % 3]}", "w").close()
+
+        def rescan():
+            for d in refs_add.get_subdirs(tmp):
+                Ref.catalog_files(f"{tmp}/{d}")
+
+        def poll(dc_mtimes):
+            for d in refs_add.poll_subdirs(tmp, dc_mtimes=dc_mtimes):
+                Ref.catalog_files(f"{tmp}/{d}")
+
+        t, _ = timeit(lambda: [rescan() for _ in range(ticks)])
+        report("rescan every subfolder", ticks, t)
+        dc_mtimes = {}
+        poll(dc_mtimes)
+        t, _ = timeit(lambda: [poll(dc_mtimes) for _ in range(ticks)])
+        report("poll changed subfolders", ticks, t)
+
+
+def bench_catalog(subdirs=100, files=300):
+    """Cataloging an inbox tree: listdir per subfolder against one scandir walk"""
+
+    def legacy_catalog(src_folder):
+        # refs_add.get_subdirs and Ref.catalog_files as they were
+        lst_pairs = []
+        for d in os.listdir(src_folder):
+            folder_path = os.path.join(src_folder, d)
+            if not os.path.isdir(folder_path) or d.startswith("_"):
+                continue
+            all_files = os.listdir(folder_path)
+            bib_files = set(f for f in all_files if f.endswith(".bib"))
+            pdf_files = set(f for f in all_files if f.endswith(".pdf"))
+            for bib_file in bib_files:
+                pdf_file = f"{os.path.splitext(bib_file)[0]}.pdf"
+                if pdf_file in pdf_files:
+                    lst_pairs.append((bib_file, pdf_file))
+        return lst_pairs
+
+    size = subdirs * files
+    print(f"\n--- Inbox catalog ({subdirs} subfolders, {files} files each)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(subdirs):
+            os.makedirs(f"{tmp}/d{i}")
+            for j in range(files):
+                open(f"{tmp}/d{i}/f{j // 2}.{['bib', 'pdf'][j % 2]}", "w").close()
+        t, lst_pairs = timeit(legacy_catalog, tmp)
+        report("listdir and isdir", size, t)
+        t, lst_walk = timeit(lambda: list(Ref.iter_catalog(tmp)))
+        report("scandir walk", size, t)
+        t, _ = timeit(lambda: next(dc for dc in Ref.iter_catalog(tmp) if dc[1]))
+        report("scandir walk (first pairs)", files, t)
+        assert len(lst_pairs) == sum(len(dc[1]) for dc in lst_walk) == size // 2
+
+
+BENCHMARKS = {
+    "tokenizer": bench_tokenizer,
+    "doi": bench_doi,
+    "ingest": bench_ingest,
+    "template": bench_template,
+    "library_read": bench_library_read,
+    "library_cache": bench_library_cache,
+    "collection": bench_collection,
+    "collection_ops": bench_collection_ops,
+    "memory": bench_memory,
+    "find": bench_find,
+    "update": bench_update,
+    "record_size": bench_record_size,
+    "boot": bench_boot,
+    "importtime": bench_importtime,
+    "note_write": bench_note_write,
+    "front_matter": bench_front_matter,
+    "yaml": bench_yaml,
+    "batch": bench_batch,
+    "refresh": bench_refresh,
+    "watch": bench_watch,
+    "catalog": bench_catalog,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run losalamos benchmarks")
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        default=list(BENCHMARKS.keys()),
+        help="Benchmarks to run: {} (default: all).".format(", ".join(BENCHMARKS)),
+    )
+    args = parser.parse_args()
+    for b in args.benchmarks:
+        BENCHMARKS[b]()
@@ -0,0 +1,237 @@
+import os
+import random
+from pathlib import Path
+
+import pytest
+
+from losalamos.refs import Ref, RefCache, RefKeys, RefManifest
+from testing.benchmarks import make_inbox, make_templates
+
+# sample bib files of the repo
+SAMPLES = sorted(Path(__file__).parent.parent.joinpath("docs/samples").glob("*.bib"))
+
+
+def chunked(text, rnd, max_size):
+    """Split a text into chunks of random size."""
+    lst_chunks = []
+    pos = 0
+    while pos < len(text):
+        size = rnd.randint(1, max_size)
+        lst_chunks.append(text[pos : pos + size])
+        pos = pos + size
+    return lst_chunks
+
+
+def test_scan_bibtex_chunks() -> None:
+    """Any chunking of the text gives the same entries as line-by-line input."""
+    rnd = random.Random(0)
+    for file_bib in SAMPLES:
+        text = file_bib.read_text(encoding="utf-8")
+        expected = list(Ref.scan_bibtex(lines=text.splitlines(keepends=True)))
+        assert len(expected) > 0
+        assert list(Ref.scan_bibtex(lines=[text])) == expected
+        for max_size in [1, 2, 5, 17, 100, 4096]:
+            for _ in range(20):
+                lines = chunked(text, rnd, max_size)
+                assert list(Ref.scan_bibtex(lines=lines)) == expected, max_size
+
+
+def test_scan_bibtex_split_header() -> None:
+    """A header with ``@type`` and ``{key,`` on separate lines is recognised."""
+    text = (
+        "free text with a loose @ sign and an e-mail me@example.org\n"
+        "@article\n"
+        "  {Key2000,\n"
+        "  author = {Doe, John},\n"
+        "  year = {2000}\n"
+        "}\n"
+        "@book {Key2001, title = {A {Nested} Title}, year = 2001}\n"
+    )
+    expected = [
+        {
+            "entry_type": "article",
+            "citation_key": "Key2000",
+            "author": "Doe, John",
+            "year": "2000",
+        },
+        {
+            "entry_type": "book",
+            "citation_key": "Key2001",
+            "title": "A {Nested} Title",
+            "year": "2001",
+        },
+    ]
+    assert list(Ref.scan_bibtex(lines=text.splitlines(keepends=True))) == expected
+    assert list(Ref.scan_bibtex(lines=[text])) == expected
+    rnd = random.Random(1)
+    for _ in range(200):
+        lines = chunked(text, rnd, 12)
+        assert list(Ref.scan_bibtex(lines=lines)) == expected
+
+
+def test_get_bib_index_corrupt(tmp_path) -> None:
+    """A truncated ``.idx`` sidecar is rebuilt and entries are found by key."""
+    file_bib = tmp_path / "refs.bib"
+    file_bib.write_text(
+        "@article{Key2000,\n  year = {2000},\n}\n"
+        "@book{Key2001,\n  year = {2001},\n}\n",
+        encoding="utf-8",
+    )
+    index = Ref.get_bib_index(file_bib=str(file_bib))
+    assert list(index["keys"]) == ["Key2000", "Key2001"]
+    file_index = tmp_path / "refs.bib.idx"
+    text = file_index.read_text(encoding="utf-8")
+    file_index.write_text(text[: len(text) // 2], encoding="utf-8")
+    assert Ref.get_bib_index(file_bib=str(file_bib)) == index
+    assert Ref.read_bib_entry(file_bib=str(file_bib), key="Key2001")["year"] == "2001"
+
+
+def test_refkeys_stale(tmp_path) -> None:
+    """A stale registry is replaced by the folder listing."""
+    (tmp_path / "Key2000.md").write_text("", encoding="utf-8")
+    (tmp_path / "Key2001.md").write_text("", encoding="utf-8")
+    ref_keys = RefKeys(lib_folder=str(tmp_path))
+    ref_keys.load()
+    ref_keys.save()
+    assert ref_keys.keys == {"Key2000", "Key2001"}
+    # a note removed by other means makes the registry stale
+    os.remove(tmp_path / "Key2001.md")
+    os.utime(tmp_path, ns=(0, os.stat(ref_keys.file_registry).st_mtime_ns + 10**9))
+    ref_keys.load()
+    assert ref_keys.keys == {"Key2000"}
+
+
+class FakeResponse:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+
+
+class FakeSession:
+    """A session answering every query with the same response."""
+
+    def __init__(self, response):
+        self.response = response
+        self.calls = 0
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls = self.calls + 1
+        return self.response
+
+
+def test_refcache_negative(tmp_path) -> None:
+    """Not found DOIs are cached with their own, shorter, time to live."""
+    cache = RefCache(lib_folder=str(tmp_path), ttl=1000, negative_ttl=10)
+    cache.load()
+    session = FakeSession(FakeResponse(404))
+    for _ in range(3):
+        assert Ref.query_doi(doi="10.1/x", session=session, cache=cache) is None
+    assert session.calls == 1
+    assert cache.get(key="doi:10.1/x") == (None, None)
+    # expired negative entry: queried again
+    cache.connection.execute("UPDATE responses SET created = created - 100")
+    session.response = FakeResponse(200, "@article{Key2000,\n  year = {2000},\n}")
+    assert Ref.query_doi(doi="10.1/x", session=session, cache=cache)["year"] == "2000"
+    assert session.calls == 2
+    cache.close()
+
+
+def test_refcache_size(tmp_path) -> None:
+    """The running number of entries drops the least recently used ones."""
+    cache = RefCache(lib_folder=str(tmp_path), max_size=3)
+    cache.load()
+    for i in range(5):
+        cache.put(key=f"k{i}", raw="", parsed={})
+        cache.put(key=f"k{i}", raw="", parsed={})
+    assert cache.size == 3
+    assert cache.get(key="k0") is None
+    assert cache.get(key="k4") == ("", {})
+    cache.close()
+    cache.load()
+    assert cache.size == 3
+    cache.close()
+
+
+def test_iter_catalog_links(tmp_path) -> None:
+    """Directories named like files and linked directories are not cataloged."""
+    tmp_path.joinpath("sub").mkdir()
+    for name in ["a.bib", "a.pdf", "sub/b.BIB", "sub/b.Pdf"]:
+        tmp_path.joinpath(name).write_text("", encoding="utf-8")
+    tmp_path.joinpath("c.pdf").mkdir()
+    tmp_path.joinpath("c.bib").write_text("", encoding="utf-8")
+    # a symlink loop
+    tmp_path.joinpath("sub", "loop").symlink_to(tmp_path, target_is_directory=True)
+    catalog = list(Ref.iter_catalog(str(tmp_path)))
+    assert catalog == [
+        ("", [("a.bib", "a.pdf")], ["c.bib"]),
+        # walked as a directory
+        ("c.pdf", [], []),
+        ("sub", [(os.path.join("sub", "b.BIB"), os.path.join("sub", "b.Pdf"))], []),
+    ]
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_add_bat_failed_pair(tmp_path, workers) -> None:
+    """One failing pair does not stop the batch: the others are added and cleaned."""
+    src_folder = tmp_path / "inbox"
+    lib_folder = tmp_path / "lib"
+    lib_folder.mkdir()
+    file_pdf = tmp_path / "sample.pdf"
+    file_pdf.write_bytes(b"%PDF-1.4")
+    make_inbox(str(src_folder), 5, str(file_pdf))
+    for i in range(1, 5):
+        # articles only: no covers to render
+        text = src_folder.joinpath(f"ref{i:05d}.bib").read_text(encoding="utf-8")
+        text = text.replace("@book{", "@article{")
+        if i == 2:
+            # no template for misc entries
+            text = text.replace("@article{", "@misc{")
+        src_folder.joinpath(f"ref{i:05d}.bib").write_text(text, encoding="utf-8")
+    src_folder.joinpath("ref00000.bib").unlink()
+    src_folder.joinpath("ref00000.pdf").unlink()
+    kwargs = dict(
+        src_folder=str(src_folder),
+        lib_folder=str(lib_folder),
+        template_folder=make_templates(str(tmp_path)),
+        clean=True,
+        workers=workers,
+    )
+    with pytest.raises(OSError):
+        Ref.add_bat(**kwargs)
+    assert sorted(os.listdir(src_folder)) == ["ref00002.bib", "ref00002.pdf"]
+    notes = [f for f in os.listdir(lib_folder) if f.endswith(".md") and "_" not in f]
+    assert len(notes) == 3
+    # the registry was saved
+    keys = lib_folder.joinpath("_keys.txt").read_text(encoding="utf-8").split()
+    assert set(f[:-3] for f in notes) <= set(keys)
+    # or collected instead of raised
+    errors = {}
+    Ref.add_bat(errors=errors, **kwargs)
+    assert list(errors) == [("ref00002.bib", "ref00002.pdf")]
+
+
+def test_ref_manifest(tmp_path) -> None:
+    """A recorded note is current until its content or the renderer changes."""
+    for name in ["a.md", "b.md"]:
+        tmp_path.joinpath(name).write_text(f"# {name}\n", encoding="utf-8")
+    file_a = str(tmp_path / "a.md")
+    manifest = RefManifest(lib_folder=str(tmp_path))
+    manifest.load()
+    assert not manifest.is_current(file_a)
+    manifest.record(file_a)
+    manifest.record(str(tmp_path / "b.md"))
+    manifest.save()
+    # reloaded from the library folder
+    manifest = RefManifest(lib_folder=str(tmp_path))
+    manifest.load()
+    assert manifest.is_current(file_a)
+    tmp_path.joinpath("a.md").write_text("# changed\n", encoding="utf-8")
+    assert not manifest.is_current(file_a)
+    # files that are gone are dropped
+    manifest.prune(names={"a.md"})
+    assert list(manifest.entries) == ["a.md"]
+    assert manifest.is_changed
+    # another renderer version starts empty
+    manifest = RefManifest(lib_folder=str(tmp_path), version="other")
+    manifest.load()
+    assert len(manifest) == 0
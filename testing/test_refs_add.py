@@ -0,0 +1,146 @@
+import threading
+import time
+
+import pytest
+
+import refs_add
+
+# seconds a pair must stay unchanged in the tests
+SETTLE = 0.3
+
+
+class FakeAdd:
+    """Stand-in for ``refs_add.add``: records the pairs and fails on a marker."""
+
+    def __init__(self):
+        self.calls = []
+        self.batches = []
+
+    def __call__(
+        self, src_folder, lib_folder, template_folder, tags, workers, pairs, errors
+    ):
+        self.batches.append(sorted(pair[0] for pair in pairs))
+        for pair in pairs:
+            with open(f"{src_folder}/{pair[0]}", encoding="utf-8") as file:
+                text = file.read()
+            self.calls.append((pair[0], time.monotonic()))
+            if "FAIL" in text:
+                errors[pair] = ValueError(f"bad bib file {pair[0]}")
+        return None
+
+    def names(self):
+        return [name for name, t in self.calls]
+
+
+@pytest.fixture
+def watcher(tmp_path, monkeypatch):
+    """Run ``watch`` in polling mode on a thread, stopped at teardown."""
+    fake = FakeAdd()
+    monkeypatch.setattr(refs_add, "add", fake)
+    monkeypatch.setattr(refs_add, "start_observer", lambda src_folder, on_change: None)
+    src_folder = tmp_path / "inbox"
+    src_folder.joinpath("topic").mkdir(parents=True)
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=refs_add.watch,
+        kwargs=dict(
+            src_folder=str(src_folder),
+            lib_folder=str(tmp_path / "lib"),
+            template_folder=str(tmp_path / "templates"),
+            interval=0.05,
+            settle=SETTLE,
+            stop=stop,
+        ),
+    )
+    thread.start()
+    yield src_folder / "topic", fake
+    stop.set()
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+
+
+def write_pair(folder, name, text="@article{Key,\n}\n"):
+    folder.joinpath(f"{name}.bib").write_text(text, encoding="utf-8")
+    folder.joinpath(f"{name}.pdf").write_bytes(b"%PDF")
+
+
+def wait_for(condition, timeout=10.0):
+    t0 = time.monotonic()
+    while not condition():
+        assert time.monotonic() - t0 < timeout, "timed out"
+        time.sleep(0.02)
+
+
+def test_watch_settled(watcher) -> None:
+    """A complete pair is added once, after it settles."""
+    folder, fake = watcher
+    t0 = time.monotonic()
+    write_pair(folder, "a")
+    wait_for(lambda: fake.names() == ["a.bib"])
+    assert fake.calls[0][1] - t0 >= SETTLE
+    time.sleep(3 * SETTLE)
+    assert fake.names() == ["a.bib"]
+
+
+def test_watch_being_written(watcher) -> None:
+    """A pair still being written waits until the writes stop."""
+    folder, fake = watcher
+    write_pair(folder, "b")
+    with open(folder / "b.pdf", "ab") as file:
+        for _ in range(int(3 * SETTLE / 0.05)):
+            file.write(b"0" * 1024)
+            file.flush()
+            time.sleep(0.05)
+    t_last = time.monotonic()
+    assert fake.names() == []
+    wait_for(lambda: fake.names() == ["b.bib"])
+    assert fake.calls[0][1] - t_last >= SETTLE - 0.05
+
+
+def test_watch_failed_retry(watcher) -> None:
+    """Only the failing pair is marked, and it is tried again once edited."""
+    folder, fake = watcher
+    write_pair(folder, "c", text="FAIL")
+    write_pair(folder, "d")
+    wait_for(lambda: sorted(fake.names()) == ["c.bib", "d.bib"])
+    # unchanged: not tried again
+    time.sleep(3 * SETTLE)
+    assert sorted(fake.names()) == ["c.bib", "d.bib"]
+    # edited in place (the folder listing does not change)
+    folder.joinpath("c.bib").write_text("@article{Key,\n}\n", encoding="utf-8")
+    wait_for(lambda: len(fake.names()) == 3)
+    assert fake.names()[-1] == "c.bib"
+
+
+def test_watch_removed_pending(watcher) -> None:
+    """A pair removed while pending is never added."""
+    folder, fake = watcher
+    write_pair(folder, "e")
+    time.sleep(SETTLE / 3)
+    folder.joinpath("e.pdf").unlink()
+    write_pair(folder, "f")
+    wait_for(lambda: fake.names() == ["f.bib"])
+    time.sleep(3 * SETTLE)
+    assert fake.names() == ["f.bib"]
+
+
+def test_watch_burst(watcher) -> None:
+    """Pairs that settle in the same poll are added in one batch."""
+    folder, fake = watcher
+    # all pairs appear at once: a folder renamed into the inbox
+    staging = folder.parent / "_staging"
+    staging.mkdir()
+    for name in ["g", "h", "i", "j"]:
+        write_pair(staging, name)
+    staging.rename(folder.parent / "burst")
+    wait_for(lambda: len(fake.names()) == 4)
+    assert fake.batches == [["g.bib", "h.bib", "i.bib", "j.bib"]]
+
+
+def test_poll_subdirs_links(tmp_path) -> None:
+    """Linked directories are not polled, as in Ref.iter_catalog."""
+    tmp_path.joinpath("topic").mkdir()
+    tmp_path.joinpath("linked").symlink_to(tmp_path / "topic", target_is_directory=True)
+    dc_mtimes = {}
+    assert refs_add.poll_subdirs(str(tmp_path), dc_mtimes=dc_mtimes) == {"topic"}
+    assert refs_add.get_subdirs(str(tmp_path)) == ["topic"]
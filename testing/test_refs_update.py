@@ -0,0 +1,32 @@
+import os
+
+import refs_update
+
+
+def test_main_manifest(tmp_path, monkeypatch) -> None:
+    """Only notes changed since the last refresh are updated, unless forced."""
+    done = []
+
+    def fake_update(note_file):
+        done.append(os.path.basename(note_file))
+        return "unchanged"
+
+    monkeypatch.setattr(refs_update, "update", fake_update)
+    for name in ["a.md", "b.md", "c.md"]:
+        tmp_path.joinpath(name).write_text(f"# {name}\n", encoding="utf-8")
+    lib_folder = str(tmp_path)
+    refs_update.main(lib_folder=lib_folder)
+    assert sorted(done) == ["a.md", "b.md", "c.md"]
+    assert os.path.isfile(tmp_path / "_manifest.json")
+    # nothing changed: skipped
+    done.clear()
+    refs_update.main(lib_folder=lib_folder)
+    assert done == []
+    # edited note
+    tmp_path.joinpath("b.md").write_text("# edited\n", encoding="utf-8")
+    refs_update.main(lib_folder=lib_folder)
+    assert done == ["b.md"]
+    # forced: all notes
+    done.clear()
+    refs_update.main(lib_folder=lib_folder, force=True)
+    assert sorted(done) == ["a.md", "b.md", "c.md"]
@@ -0,0 +1,170 @@
+import os
+
+from losalamos.root import Collection, MbaE, Note, run_batch
+from testing.benchmarks import (
+    legacy_note_to_file,
+    legacy_parse_metadata,
+    legacy_parse_yaml,
+    make_yaml_header,
+)
+
+
+def make_collection(size):
+    """Get a reference-mode Collection of ``size`` MbaE objects."""
+    c = Collection(base_object=MbaE, copy_objects=False)
+    c.extend([MbaE(name=f"n{i:03d}", alias=f"a{i}") for i in range(size)])
+    return c
+
+
+def test_collection_remove_pending() -> None:
+    """Removals before the catalog is built drop only the removed names."""
+    c = make_collection(10)
+    for i in range(0, 10, 2):
+        c.remove(f"n{i:03d}")
+    # removed and appended again before the catalog is built
+    c.append(MbaE(name="n004", alias="new"))
+    c.remove("n005")
+    df = c.catalog
+    assert df["Name"].tolist() == ["n001", "n003", "n004", "n007", "n009"]
+    assert df.loc[df["Name"] == "n004", "Alias"].tolist() == ["new"]
+    assert c.size == 5
+
+
+def test_collection_index_after_update() -> None:
+    """Creating an index after update(details=True) refreshes the other indexes."""
+    c = make_collection(5)
+    c.create_index("Alias")
+    c.collection["n002"].alias = "changed"
+    c.update(details=True)
+    c.create_index("Name", kind="sorted")
+    assert c.find(Alias="a2") == []
+    assert c.find(Alias="changed") == [c.collection["n002"]]
+    assert c.find(Name=("n001", "n002"), Alias="changed") == [c.collection["n002"]]
+
+
+def half(item):
+    """Half of an even number (fails on odd numbers)."""
+    if item % 2:
+        raise ValueError("odd")
+    return item // 2
+
+
+def test_run_batch() -> None:
+    """A failing item is recorded and the run goes on, in item order."""
+    for workers in [None, 2]:
+        report = run_batch(func=half, items=[4, 3, 8], workers=workers, verbose=False)
+        assert [dc["ok"] for dc in report["results"]] == [True, False, True]
+        assert [dc["result"] for dc in report["results"]] == [2, None, 4]
+        assert report["counts"] == {"2": 1, "4": 1, "failed": 1}
+
+
+def test_collection_catalog_lazy() -> None:
+    """Appends are buffered and applied (deduplicated and sorted) on access."""
+    c = Collection(base_object=MbaE, copy_objects=False)
+    for i in [3, 1, 2]:
+        c.append(MbaE(name=f"n{i:03d}", alias=f"a{i}"))
+    c.append(MbaE(name="n001", alias="again"))
+    assert len(c._pending_rows) == 4
+    df = c.catalog
+    assert c._pending_rows == []
+    assert df["Name"].tolist() == ["n001", "n002", "n003"]
+    assert df["Alias"].tolist() == ["again", "a2", "a3"]
+    assert c.catalog is df
+    assert c.size == 3
+
+
+def test_collection_update_dirty() -> None:
+    """A dirty-only update gives the same catalog as a full update."""
+    c_full = make_collection(6)
+    c_dirty = make_collection(6)
+    for c in [c_full, c_dirty]:
+        c.catalog
+        c.collection["n001"].alias = "changed"
+        c.collection["n004"].name = "renamed"
+    c_full.update(details=True)
+    c_dirty.mark_dirty("n001")
+    c_dirty.mark_dirty("n004")
+    c_dirty.update(details=True, dirty_only=True)
+    assert c_dirty.catalog.to_dict("records") == c_full.catalog.to_dict("records")
+    assert "renamed" in c_dirty.collection
+    assert "n004" not in c_dirty.collection
+    assert c_dirty.size == 6
+
+
+def make_note():
+    """Get a Note with metadata and Head, Body and Tail data."""
+    n = Note()
+    n.metadata = {"title": "A note", "number": None, "tags": ["a", "b"]}
+    n.data = {
+        "Head": ["# A note", "", "", "intro"],
+        "Body": ["text", "", "", "", "more text"],
+        "Tail": ["end"],
+    }
+    return n
+
+
+def test_note_write_if_changed(tmp_path) -> None:
+    """An unchanged note is not written again (the file is left untouched)."""
+    file_note = str(tmp_path / "note.md")
+    file_legacy = str(tmp_path / "legacy.md")
+    n = make_note()
+    assert n.to_file(file_path=file_note)
+    legacy_note_to_file(n, file_legacy)
+    with open(file_note, "rb") as f1, open(file_legacy, "rb") as f2:
+        assert f1.read() == f2.read()
+    # set an old mtime to detect any write
+    os.utime(file_note, ns=(10**9, 10**9))
+    assert not n.to_file(file_path=file_note)
+    assert os.stat(file_note).st_mtime_ns == 10**9
+    n.data["Tail"] = ["changed"]
+    assert n.to_file(file_path=file_note)
+    assert os.stat(file_note).st_mtime_ns != 10**9
+    assert sorted(os.listdir(tmp_path)) == ["legacy.md", "note.md"]
+
+
+def test_note_parse_metadata(tmp_path) -> None:
+    """Reading only the header gives the metadata of reading the whole file."""
+    lst_texts = [
+        "---\n" + make_yaml_header(1) + "\n---\n\n# Title\n\n---\nbody\n---\ntail\n",
+        "---\n\n\ntitle: x\n---\n---\nbody\n",
+        "---\ntitle: x\n---   \nbody\n",
+        "---\ntitle: x\nno closing line\n",
+        "---\n---\ntitle: x\n---\nbody\n",
+        "# no header\n---\ntitle: x\n---\n",
+        "",
+    ]
+    for i, text in enumerate(lst_texts):
+        file_note = tmp_path / f"note{i}.md"
+        file_note.write_text(text, encoding="utf-8")
+        expected = legacy_parse_metadata(str(file_note))
+        assert Note.parse_metadata(str(file_note)) == expected, text
+    assert Note.parse_metadata(str(tmp_path / "note0.md"))["year"] == "1951"
+    assert Note.parse_metadata(str(tmp_path / "note5.md")) is None
+
+
+def test_note_parse_yaml() -> None:
+    """The single-pass parser matches the former one on note headers."""
+    for i in range(30):
+        yaml_content = make_yaml_header(i)
+        assert Note.parse_yaml(yaml_content) == legacy_parse_yaml(yaml_content)
+    yaml_content = "\n".join(
+        [
+            "tags: - land-use - ecology",
+            'aliases: [a, "b, c"]',
+            "related:",
+            "number: ",
+            'title: "Quoted: yes"',
+            "links:",
+            " - http://example.com",
+            "after: z",
+        ]
+    )
+    assert Note.parse_yaml(yaml_content) == {
+        "tags": ["land-use", "ecology"],
+        "aliases": ["a", "b, c"],
+        "related": None,
+        "number": None,
+        "title": "Quoted: yes",
+        "links": ["http://example.com"],
+        "after": "z",
+    }